@@ -0,0 +1,44 @@
+"""
+Keyed-HMAC pseudonyms for anonymous evaluations.
+
+A student's pseudonym is HMAC-SHA256(ANONYMITY['KEY'], "<pk>:<aun_id>"), computed once and
+stored on the user next to the id of the key that produced it, so starting an evaluation
+only copies a column. After rotating the key (new ANONYMITY_KEY and ANONYMITY_KEY_ID),
+stored pseudonyms are recomputed lazily on next use, or in bulk with
+``manage.py backfill_pseudonyms``.
+"""
+import hashlib
+import hmac
+
+from django.conf import settings
+
+PSEUDONYM_LENGTH = 32
+
+
+def current_key():
+    '''(key_id, secret) of the active anonymity key'''
+    config = settings.ANONYMITY
+    return config['KEY_ID'], config['KEY'].encode()
+
+
+def keyed_digest(message, length=PSEUDONYM_LENGTH):
+    '''Hex HMAC-SHA256 of ``message`` under the active key, truncated to ``length``'''
+    _, key = current_key()
+    return hmac.new(key, str(message).encode(), hashlib.sha256).hexdigest()[:length]
+
+
+def compute_pseudonym(user):
+    return keyed_digest(f'{user.pk}:{user.aun_id}')
+
+
+def ensure_pseudonym(user):
+    '''Return the user's stored pseudonym, computing and saving it only if missing or stale'''
+    key_id, _ = current_key()
+    if user.anonymous_id and user.anonymous_key_id == key_id:
+        return user.anonymous_id
+
+    user.anonymous_id = compute_pseudonym(user)
+    user.anonymous_key_id = key_id
+    # A queryset update skips post_save, so dashboard caches are not invalidated for this
+    type(user).objects.filter(pk=user.pk).update(anonymous_id=user.anonymous_id, anonymous_key_id=key_id)
+    return user.anonymous_id
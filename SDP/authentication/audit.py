@@ -0,0 +1,185 @@
+"""
+Buffered, asynchronous writer for audit rows (LoginAttempt, UserSession, ...).
+
+Login requests enqueue their audit writes instead of performing them inline; a daemon
+thread flushes the queue with bulk_create/bulk_update once ``batch_size`` items are
+waiting or ``flush_interval_ms`` milliseconds after the oldest of them arrived, and
+drains it when the process exits. If the queue is full (or async writes are disabled)
+the write happens synchronously instead, so rows are delayed under load, not dropped.
+A batch that fails is retried, then written row by row; only rows the database keeps
+rejecting are lost, and each of them is logged. auto_now_add timestamps are stamped at
+flush time, at most one flush interval after the event.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+WRITE_ATTEMPTS = 3
+RETRY_DELAY = 0.2
+
+
+class AuditWriter:
+    def __init__(self, batch_size=200, flush_interval_ms=250, max_queue=10000, enabled=True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.enabled = enabled
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    # Producers -------------------------------------------------------------
+    
+    def create(self, instance):
+        """Insert an unsaved model instance"""
+        self._submit(('create', instance))
+    
+    def update(self, model, pk, **fields):
+        """UPDATE model SET fields WHERE pk=pk (last write per row wins within a batch)"""
+        self._submit(('update', model, pk, fields))
+    
+    def _submit(self, item):
+        if self.enabled and self._ensure_thread():
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                logger.warning('Audit queue full; writing synchronously')
+        self._write([item])
+    
+    # Consumer --------------------------------------------------------------
+    
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.shutdown)
+        return True
+    
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # The whole batch waits at most one interval, however steadily items trickle in
+            deadline = time.monotonic() + self.flush_interval
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+            if _STOP in batch:
+                stopping = True
+                batch = [item for item in batch if item is not _STOP]
+            if batch:
+                close_old_connections()
+                self._write(batch)
+    
+    def _write(self, items):
+        creates = defaultdict(list)
+        updates = defaultdict(OrderedDict)
+        callbacks = []
+        for item in items:
+            if item[0] == 'create':
+                creates[type(item[1])].append(item[1])
+            elif item[0] == 'update':
+                _, model, pk, fields = item
+                updates[(model, tuple(sorted(fields)))][pk] = fields
+            else:
+                callbacks.append(item[1])
+        
+        try:
+            for attempt in range(1, WRITE_ATTEMPTS + 1):
+                try:
+                    # Savepoint, so a failure inside a request's transaction can be retried
+                    with transaction.atomic():
+                        for model, instances in creates.items():
+                            model.objects.bulk_create(instances, ignore_conflicts=True)
+                        for (model, field_names), rows in updates.items():
+                            model.objects.bulk_update(
+                                [model(pk=pk, **fields) for pk, fields in rows.items()], list(field_names)
+                            )
+                    return
+                except Exception:
+                    logger.warning('Writing %d audit records failed (attempt %d)', len(items), attempt, exc_info=True)
+                    if threading.current_thread() is self._thread:
+                        # Drop a broken connection so the next attempt reconnects
+                        close_old_connections()
+                    if attempt < WRITE_ATTEMPTS:
+                        time.sleep(RETRY_DELAY * attempt)
+            self._write_rows(creates, updates)
+        finally:
+            for done in callbacks:
+                done.set()
+    
+    def _write_rows(self, creates, updates):
+        """Last resort for a failing batch: write row by row so one bad row loses only itself"""
+        for model, instances in creates.items():
+            for instance in instances:
+                try:
+                    with transaction.atomic():
+                        model.objects.bulk_create([instance], ignore_conflicts=True)
+                except Exception:
+                    logger.exception('Dropped audit record %r', instance)
+        for (model, _), rows in updates.items():
+            for pk, fields in rows.items():
+                try:
+                    with transaction.atomic():
+                        model.objects.filter(pk=pk).update(**fields)
+                except Exception:
+                    logger.exception('Dropped audit update of %s %s: %r', model.__name__, pk, fields)
+    
+    def flush(self, timeout=5):
+        """Block until everything queued so far has been written"""
+        if self._thread is None or not self._thread.is_alive():
+            self._drain_inline()
+            return
+        done = threading.Event()
+        self._submit(('callback', done))
+        done.wait(timeout)
+    
+    def _drain_inline(self):
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        items = [item for item in items if item is not _STOP]
+        if items:
+            self._write(items)
+    
+    def shutdown(self, timeout=5):
+        """Stop the worker after it has drained the queue"""
+        if self._thread is None or not self._thread.is_alive():
+            self._drain_inline()
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._drain_inline()
+
+
+def _from_settings():
+    config = getattr(settings, 'AUDIT_LOG', {})
+    return AuditWriter(
+        batch_size=config.get('BATCH_SIZE', 200),
+        flush_interval_ms=config.get('FLUSH_INTERVAL_MS', 250),
+        max_queue=config.get('MAX_QUEUE', 10000),
+        enabled=config.get('ASYNC', True),
+    )
+
+
+audit_writer = _from_settings()
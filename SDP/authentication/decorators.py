@@ -1,4 +1,5 @@
 from functools import wraps
+from asgiref.sync import iscoroutinefunction
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.http import HttpResponseForbidden, JsonResponse
@@ -116,51 +117,84 @@ def department_access_required(view_func):
     return _wrapped_view
 
 def ajax_login_required(view_func):
-    """Decorator for AJAX views that require authentication"""
+    """Decorator for AJAX views that require authentication (sync or async views)"""
+    def unauthenticated():
+        return JsonResponse({
+            'error': 'Authentication required',
+            'redirect': '/login/'
+        }, status=401)
+    
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _async_wrapped_view(request, *args, **kwargs):
+            user = await request.auser()
+            if not user.is_authenticated:
+                return unauthenticated()
+            return await view_func(request, *args, **kwargs)
+        return _async_wrapped_view
+    
     @wraps(view_func)
     def _wrapped_view(request, *args, **kwargs):
         if not request.user.is_authenticated:
-            return JsonResponse({
-                'error': 'Authentication required',
-                'redirect': '/login/'
-            }, status=401)
+            return unauthenticated()
         return view_func(request, *args, **kwargs)
     return _wrapped_view
 
 def ajax_role_required(allowed_roles):
-    """Decorator for AJAX views with role restrictions"""
+    """Decorator for AJAX views with role restrictions (sync or async views)"""
+    def forbidden():
+        return JsonResponse({
+            'error': 'Insufficient permissions',
+            'required_roles': allowed_roles
+        }, status=403)
+    
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            @ajax_login_required
+            async def _async_wrapped_view(request, *args, **kwargs):
+                user = await request.auser()
+                if not hasattr(user, 'role') or user.role not in allowed_roles:
+                    return forbidden()
+                return await view_func(request, *args, **kwargs)
+            return _async_wrapped_view
+        
         @wraps(view_func)
         @ajax_login_required
         def _wrapped_view(request, *args, **kwargs):
             if not hasattr(request.user, 'role') or request.user.role not in allowed_roles:
-                return JsonResponse({
-                    'error': 'Insufficient permissions',
-                    'required_roles': allowed_roles
-                }, status=403)
+                return forbidden()
             return view_func(request, *args, **kwargs)
         return _wrapped_view
     return decorator
 
-def rate_limit_required(max_attempts=5, time_window_minutes=15):
+def rate_limit_required(max_attempts=None, time_window_minutes=None):
     """
     Decorator to implement rate limiting for views
     Useful for login attempts, form submissions, etc.
+    Checks the cache-backed failed-login counters; defaults come from settings.
+    The limiters are exposed as ``request.login_rate_limiters`` so the view records
+    failures in the same window it was checked against.
     """
     def decorator(view_func):
+        from .utils import login_rate_limiters
+        limiters = login_rate_limiters(max_attempts, time_window_minutes)
+        
         @wraps(view_func)
         def _wrapped_view(request, *args, **kwargs):
             from .utils import check_rate_limit, get_client_ip
             
             client_ip = get_client_ip(request)
+            request.login_rate_limiters = limiters
             
-            if not check_rate_limit(client_ip, max_attempts, time_window_minutes):
-                if request.is_ajax():
+            if not check_rate_limit(client_ip, limiters=limiters):
+                minutes = limiters[0].window // 60
+                if request.headers.get('x-requested-with') == 'XMLHttpRequest' or request.content_type == 'application/json':
                     return JsonResponse({
-                        'error': f'Rate limit exceeded. Please try again after {time_window_minutes} minutes.'
+                        'error': f'Rate limit exceeded. Please try again after {minutes} minutes.'
                     }, status=429)
                 else:
-                    messages.error(request, f'Too many attempts. Please try again after {time_window_minutes} minutes.')
+                    messages.error(request, f'Too many attempts. Please try again after {minutes} minutes.')
                     return redirect('login')
             
             return view_func(request, *args, **kwargs)
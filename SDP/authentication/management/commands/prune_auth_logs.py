@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from authentication.models import LoginAttempt, UserSession
+
+
+class Command(BaseCommand):
+    help = "Delete login attempts and user session records older than the retention window (schedule daily)"
+
+    def add_arguments(self, parser):
+        retention = settings.DATA_RETENTION
+        parser.add_argument(
+            "--login-days",
+            type=int,
+            default=retention['LOGIN_ATTEMPT_DAYS'],
+            help="Keep login attempts for this many days",
+        )
+        parser.add_argument(
+            "--session-days",
+            type=int,
+            default=retention['USER_SESSION_DAYS'],
+            help="Keep user session records for this many days",
+        )
+        parser.add_argument("--batch-size", type=int, default=retention['BATCH_SIZE'], help="Rows deleted per transaction")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows would be deleted")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        targets = [
+            ('login attempts', LoginAttempt.objects.filter(timestamp__lt=now - timedelta(days=options['login_days']))),
+            # Sessions older than the window are long past SESSION_COOKIE_AGE, active flag or not
+            ('user sessions', UserSession.objects.filter(login_time__lt=now - timedelta(days=options['session_days']))),
+        ]
+        for label, queryset in targets:
+            if options['dry_run']:
+                self.stdout.write(f"Would delete {queryset.count()} {label}")
+                continue
+            deleted = self.delete_in_batches(queryset, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} {label}"))
+
+    def delete_in_batches(self, queryset, batch_size):
+        deleted = 0
+        while True:
+            ids = list(queryset.order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            with transaction.atomic():
+                deleted += queryset.model.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from authentication.stats import refresh_admin_statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the cached admin dashboard statistics (schedule this, e.g. every minute)"
+
+    def handle(self, *args, **options):
+        snapshot = refresh_admin_statistics()
+        self.stdout.write(self.style.SUCCESS(f"Dashboard statistics refreshed at {snapshot['generated_at']}."))
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0006_remove_verification_token"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evaluationkey",
+            name="shard_count",
+            field=models.PositiveSmallIntegerField(
+                default=0, help_text="Number of usage counter shards (0 = single counter)"
+            ),
+        ),
+        migrations.CreateModel(
+            name="EvaluationKeyUsageShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("shard", models.PositiveSmallIntegerField()),
+                ("allocation", models.IntegerField()),
+                ("used", models.IntegerField(default=0)),
+                (
+                    "evaluation_key",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="usage_shards",
+                        to="authentication.evaluationkey",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("evaluation_key", "shard")},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0007_evaluationkey_shard_count_evaluationkeyusageshard"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="evaluationkey",
+            index=models.Index(fields=["department", "-created_at"], name="evalkey_dept_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="loginattempt",
+            index=models.Index(
+                fields=["ip_address", "success", "-timestamp"], name="loginattempt_ip_success_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loginattempt",
+            index=models.Index(
+                condition=models.Q(("success", False)), fields=["-timestamp"], name="loginattempt_failed_ts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loginattempt",
+            index=models.Index(
+                condition=models.Q(("success", True)), fields=["-timestamp"], name="loginattempt_success_ts_idx"
+            ),
+        ),
+    ]
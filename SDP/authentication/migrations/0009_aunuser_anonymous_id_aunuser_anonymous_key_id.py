@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0008_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aunuser",
+            name="anonymous_id",
+            field=models.CharField(blank=True, editable=False, help_text="Stored evaluation pseudonym", max_length=32),
+        ),
+        migrations.AddField(
+            model_name="aunuser",
+            name="anonymous_key_id",
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
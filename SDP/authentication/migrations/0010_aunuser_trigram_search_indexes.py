@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:20
+
+from django.db import migrations
+
+# icontains compiles to UPPER("column"::text) LIKE UPPER(%s) on PostgreSQL, so the
+# trigram indexes are built on that exact expression.
+SEARCH_COLUMNS = ["aun_id", "full_name", "aun_email"]
+
+
+def index_name(column):
+    return f"aunuser_{column}_trgm_idx"
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            # Servers without contrib keep the (unindexed) icontains search
+            return
+    table = schema_editor.quote_name(apps.get_model("authentication", "AUNUser")._meta.db_table)
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name(column)} ON {table} "
+            f"USING gin (UPPER({schema_editor.quote_name(column)}::text) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index_name(column)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0009_aunuser_anonymous_id_aunuser_anonymous_key_id"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
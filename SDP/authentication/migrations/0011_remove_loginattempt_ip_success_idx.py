@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0010_aunuser_trigram_search_indexes"),
+    ]
+
+    operations = [
+        # Login throttling counts attempts in the cache, so nothing filters attempts by address
+        migrations.RemoveIndex(
+            model_name="loginattempt",
+            name="loginattempt_ip_success_idx",
+        ),
+    ]
@@ -1,10 +1,17 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import RegexValidator
 from django.utils import timezone
-import hashlib
+import random
+import secrets
 import uuid
 
+from .anonymity import ensure_pseudonym
+
 class Department(models.Model):
     """Represents academic and administrative departments at AUN"""
     name = models.CharField(max_length=100, unique=True)
@@ -115,6 +122,8 @@ class AUNUser(AbstractUser):
     # Privacy settings
     allow_feedback_contact = models.BooleanField(default=True)
     anonymous_evaluations = models.BooleanField(default=True, help_text="For student evaluations")
+    anonymous_id = models.CharField(max_length=32, blank=True, editable=False, help_text="Stored evaluation pseudonym")
+    anonymous_key_id = models.CharField(max_length=16, blank=True, editable=False)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -153,10 +162,7 @@ class AUNUser(AbstractUser):
     def get_encrypted_identity(self):
         """Return consistent hashed identity for anonymous evaluations"""
         if self.anonymous_evaluations and self.is_student:
-            # Create a consistent hash based on user ID and SECRET_KEY
-            from django.conf import settings
-            identity_string = f"{settings.SECRET_KEY}{self.aun_id}{self.id}"
-            return hashlib.sha256(identity_string.encode()).hexdigest()[:16]
+            return ensure_pseudonym(self)
         return None
     
     def can_evaluate_department(self, department):
@@ -198,6 +204,165 @@ class UserSession(models.Model):
     def __str__(self):
         return f"{self.user.aun_id} - {self.login_time}"
 
+# Evaluation key characters, without the easily confused 0/O and 1/I
+KEY_ALPHABET = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+MAX_MINT_ROUNDS = 5
+KEY_STATUS_CACHE_PREFIX = 'evalkey:status:'
+
+class EvaluationKeyManager(models.Manager):
+    """Manager with race-free key consumption and bulk minting"""
+    
+    def key_candidates(self, count, length=8):
+        """
+        Up to ``count`` distinct random keys that no EvaluationKey uses yet, checked
+        with a single ``key__in`` query. Rarely fewer than ``count`` are returned.
+        """
+        candidates = set()
+        while len(candidates) < count:
+            candidates.add(''.join(secrets.choice(KEY_ALPHABET) for _ in range(length)))
+        taken = set(self.filter(key__in=candidates).values_list('key', flat=True))
+        return [key for key in candidates if key not in taken]
+    
+    def mint(self, department, created_by, descriptions, valid_until, usage_limit=100, shard_count=0, length=8):
+        """
+        Create one key per entry in ``descriptions`` and return them in the same order.
+        
+        Candidates are generated in memory, existing keys are filtered out with one
+        query and the rest go in with one INSERT ... ON CONFLICT DO NOTHING. Only keys
+        that lost a race with a concurrent insert are regenerated, so a thousand keys
+        take a few queries in total.
+        """
+        pending = list(enumerate(descriptions))
+        minted = {}
+        with transaction.atomic():
+            for _ in range(MAX_MINT_ROUNDS):
+                if not pending:
+                    break
+                keys = self.key_candidates(len(pending), length)
+                batch = dict(zip(keys, pending))
+                self.bulk_create(
+                    [
+                        self.model(
+                            key=key,
+                            department=department,
+                            created_by=created_by,
+                            description=description,
+                            usage_limit=usage_limit,
+                            valid_until=valid_until,
+                            shard_count=shard_count,
+                        )
+                        for key, (_, description) in batch.items()
+                    ],
+                    ignore_conflicts=True,
+                )
+                # ignore_conflicts returns no primary keys, so read back what actually landed
+                for eval_key in self.filter(
+                    key__in=keys, department=department, created_by=created_by, valid_until=valid_until
+                ):
+                    minted[batch[eval_key.key][0]] = eval_key
+                pending = [item for item in pending if item[0] not in minted]
+            if pending:
+                raise RuntimeError(f'Could not mint {len(pending)} unique evaluation keys')
+            # bulk_create skips post_save; clear any cached "unknown key" answers
+            self.forget_status(*(eval_key.key for eval_key in minted.values()))
+            
+            if shard_count:
+                EvaluationKeyUsageShard.objects.bulk_create([
+                    shard
+                    for eval_key in minted.values()
+                    for shard in EvaluationKeyUsageShard.split(eval_key, shard_count, usage_limit)
+                ])
+        return [minted[index] for index in range(len(descriptions))]
+    
+    def consume(self, key, department_id):
+        """
+        Atomically record one use of a key and return its id, or None if the key is
+        unknown, inactive, outside its validity window or out of uses.
+        
+        Plain keys are consumed with a single conditional UPDATE ... RETURNING, so
+        concurrent starts can never push usage_count past usage_limit.
+        """
+        now = timezone.now()
+        connection = connections[router.db_for_write(self.model)]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET usage_count = usage_count + 1 "
+                "WHERE key = %s AND department_id = %s AND is_active = %s AND shard_count = 0 "
+                "AND usage_count < usage_limit AND valid_from <= %s AND valid_until >= %s "
+                "RETURNING id",
+                [key, department_id, True, now, now],
+            )
+            row = cursor.fetchone()
+        if row:
+            self.forget_status(key)
+            return row[0]
+        
+        # Hot keys spread their quota over counter shards instead of one row
+        sharded = self.filter(
+            key=key, department_id=department_id, is_active=True, shard_count__gt=0,
+            valid_from__lte=now, valid_until__gte=now,
+        ).values_list('id', 'shard_count').first()
+        if sharded is None:
+            return None
+        key_id, shard_count = sharded
+        start = random.randrange(shard_count)
+        for offset in range(shard_count):
+            updated = EvaluationKeyUsageShard.objects.filter(
+                evaluation_key_id=key_id, shard=(start + offset) % shard_count, used__lt=F('allocation')
+            ).update(used=F('used') + 1)
+            if updated:
+                self.forget_status(key)
+                return key_id
+        return None
+    
+    def cached_status(self, key):
+        """
+        Read-through cache of what validating ``key`` needs: its department, validity
+        window, limit and usage. Returns None for unknown keys; those misses are cached
+        too, briefly, so probing random keys does not reach the database either.
+        """
+        cache_key = KEY_STATUS_CACHE_PREFIX + key
+        status = cache.get(cache_key)
+        if status is not None:
+            return status or None
+        
+        status = self._status_query(key).first()
+        cache.set(cache_key, *self._status_entry(status))
+        return status
+    
+    async def acached_status(self, key):
+        """Async version of cached_status() for views served under ASGI"""
+        cache_key = KEY_STATUS_CACHE_PREFIX + key
+        status = await cache.aget(cache_key)
+        if status is not None:
+            return status or None
+        
+        status = await self._status_query(key).afirst()
+        await cache.aset(cache_key, *self._status_entry(status))
+        return status
+    
+    def _status_query(self, key):
+        return self.filter(key=key).annotate(
+            department_active=F('department__is_active'),
+            shard_usage=Coalesce(Sum('usage_shards__used'), 0),
+        ).values(
+            'id', 'department_id', 'department_active', 'is_active', 'valid_from', 'valid_until',
+            'usage_limit', 'usage_count', 'shard_usage', 'description',
+        )
+    
+    def _status_entry(self, status):
+        """Fold shard usage into ``status`` and return the (value, timeout) to cache"""
+        if status is None:
+            return {}, settings.EVALUATION_KEY_MISS_TTL
+        status['usage_count'] += status.pop('shard_usage')
+        return status, settings.EVALUATION_KEY_STATUS_TTL
+    
+    def forget_status(self, *keys):
+        """Drop cached statuses once the surrounding transaction commits"""
+        cache_keys = [KEY_STATUS_CACHE_PREFIX + key for key in keys]
+        transaction.on_commit(lambda: cache.delete_many(cache_keys), using=router.db_for_write(self.model))
+
 class EvaluationKey(models.Model):
     """Unique keys for accessing evaluations"""
     key = models.CharField(max_length=20, unique=True)
@@ -213,16 +378,36 @@ class EvaluationKey(models.Model):
     valid_from = models.DateTimeField(default=timezone.now)
     valid_until = models.DateTimeField()
     
+    # Hot keys (e.g. shared with a whole lecture hall) can split their quota over
+    # several counter rows so concurrent starts do not queue on a single row
+    shard_count = models.PositiveSmallIntegerField(
+        default=0, help_text="Number of usage counter shards (0 = single counter)"
+    )
+    
     # Metadata
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = EvaluationKeyManager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # manage_evaluation_keys lists a department's keys newest first;
+            # lookups by key are already served by its unique index
+            models.Index(fields=['department', '-created_at'], name='evalkey_dept_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.key} - {self.department.code}"
     
+    @property
+    def total_usage(self):
+        """Uses recorded on the key row plus any counter shards"""
+        if not self.shard_count:
+            return self.usage_count
+        return self.usage_count + (self.usage_shards.aggregate(total=Sum('used'))['total'] or 0)
+    
     @property
     def is_valid(self):
         now = timezone.now()
@@ -230,16 +415,54 @@ class EvaluationKey(models.Model):
             self.is_active and 
             self.valid_from and self.valid_until and
             self.valid_from <= now <= self.valid_until and
-            self.usage_count < self.usage_limit
+            self.total_usage < self.usage_limit
         )
     
     def use_key(self):
-        """Increment usage count when key is used"""
-        if self.is_valid:
-            self.usage_count += 1
-            self.save()
-            return True
-        return False
+        """Atomically record one use of this key"""
+        return EvaluationKey.objects.consume(self.key, self.department_id) is not None
+    
+    def set_shard_count(self, shard_count):
+        """
+        Split the remaining quota over ``shard_count`` counter rows (0 folds the
+        shards back into usage_count). Each shard only hands out its own allocation,
+        so the overall usage_limit still holds exactly.
+        """
+        with transaction.atomic():
+            key = EvaluationKey.objects.select_for_update().get(pk=self.pk)
+            key.usage_count = key.total_usage
+            key.usage_shards.all().delete()
+            
+            remaining = max(key.usage_limit - key.usage_count, 0)
+            EvaluationKeyUsageShard.objects.bulk_create(EvaluationKeyUsageShard.split(key, shard_count, remaining))
+            key.shard_count = shard_count
+            key.save(update_fields=['usage_count', 'shard_count'])
+        self.usage_count, self.shard_count = key.usage_count, key.shard_count
+
+class EvaluationKeyUsageShard(models.Model):
+    """Slice of a hot evaluation key's usage quota"""
+    evaluation_key = models.ForeignKey(EvaluationKey, on_delete=models.CASCADE, related_name='usage_shards')
+    shard = models.PositiveSmallIntegerField()
+    allocation = models.IntegerField()
+    used = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ('evaluation_key', 'shard')
+    
+    @classmethod
+    def split(cls, evaluation_key, shard_count, remaining):
+        """Unsaved shards sharing ``remaining`` uses as evenly as possible"""
+        return [
+            cls(
+                evaluation_key=evaluation_key,
+                shard=shard,
+                allocation=remaining // shard_count + (1 if shard < remaining % shard_count else 0),
+            )
+            for shard in range(shard_count)
+        ]
+    
+    def __str__(self):
+        return f"{self.evaluation_key_id}#{self.shard} ({self.used}/{self.allocation})"
 
 class LoginAttempt(models.Model):
     """Track login attempts for security monitoring"""
@@ -252,6 +475,10 @@ class LoginAttempt(models.Model):
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['-timestamp'], condition=Q(success=False), name='loginattempt_failed_ts_idx'),
+            models.Index(fields=['-timestamp'], condition=Q(success=True), name='loginattempt_success_ts_idx'),
+        ]
     
     def __str__(self):
         status = "SUCCESS" if self.success else "FAILED"
@@ -0,0 +1,58 @@
+"""
+Cache-backed sliding-window rate limiting.
+
+Counters live in the Django cache instead of being derived from LoginAttempt rows, so
+a check costs one cache round-trip rather than a COUNT(*) over an ever-growing table.
+The window is approximated with two fixed buckets: the previous bucket's count is
+weighted by how much of it still overlaps the sliding window.
+"""
+import time
+
+from django.core.cache import caches
+
+
+class SlidingWindowRateLimiter:
+    """Allow at most ``limit`` hits per ``window_seconds`` for each identifier"""
+    
+    def __init__(self, scope, limit, window_seconds, cache_alias='default'):
+        self.scope = scope
+        self.limit = limit
+        self.window = window_seconds
+        self.cache_alias = cache_alias
+    
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+    
+    def _keys(self, identifier, now=None):
+        now = time.time() if now is None else now
+        bucket = int(now // self.window)
+        elapsed = (now % self.window) / self.window
+        current = f"ratelimit:{self.scope}:{identifier}:{bucket}"
+        previous = f"ratelimit:{self.scope}:{identifier}:{bucket - 1}"
+        return current, previous, 1 - elapsed
+    
+    def count(self, identifier):
+        """Estimated hits inside the sliding window"""
+        current, previous, weight = self._keys(identifier)
+        counts = self.cache.get_many([current, previous])
+        return counts.get(current, 0) + counts.get(previous, 0) * weight
+    
+    def is_allowed(self, identifier):
+        return self.count(identifier) < self.limit
+    
+    def hit(self, identifier):
+        """Record one hit and return the current bucket's count"""
+        current, _, _ = self._keys(identifier)
+        # Buckets must outlive the window they are weighted into
+        self.cache.add(current, 0, timeout=self.window * 2)
+        try:
+            return self.cache.incr(current)
+        except ValueError:
+            # Evicted between add() and incr()
+            self.cache.set(current, 1, timeout=self.window * 2)
+            return 1
+    
+    def reset(self, identifier):
+        current, previous, _ = self._keys(identifier)
+        self.cache.delete_many([current, previous])
@@ -0,0 +1,54 @@
+"""
+OpenAPI entries for plain async Django views.
+
+drf-spectacular only discovers DRF views, so async endpoints served under ASGI are added
+to the generated schema by this postprocessing hook (see SPECTACULAR_SETTINGS).
+"""
+
+DEPARTMENTS_LIST = {
+    'operationId': 'auth_departments_list',
+    'tags': ['Public'],
+    'summary': 'Get Departments List',
+    'description': 'Get list of all active departments available for registration and evaluation',
+    'security': [{}],
+    'responses': {
+        '200': {
+            'description': 'Departments retrieved successfully',
+            'content': {
+                'application/json': {
+                    'example': {
+                        'success': True,
+                        'data': {
+                            'departments': [
+                                {
+                                    'id': 1,
+                                    'name': 'Computer Science',
+                                    'code': 'CS',
+                                    'description': 'Department of Computer Science'
+                                },
+                                {
+                                    'id': 2,
+                                    'name': 'Business Administration',
+                                    'code': 'BA',
+                                    'description': 'Department of Business Administration'
+                                }
+                            ],
+                            'count': 2
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+ASYNC_VIEW_OPERATIONS = {
+    ('/auth/departments/', 'get'): DEPARTMENTS_LIST,
+}
+
+
+def add_async_view_operations(result, generator, request, public):
+    """Postprocessing hook: document async views next to the generated DRF operations"""
+    for (path, method), operation in ASYNC_VIEW_OPERATIONS.items():
+        result['paths'].setdefault(path, {})[method] = operation
+    return result
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import AUNUser, Department, EvaluationKey
+from .stats import invalidate_admin_statistics
+from .utils import invalidate_active_departments
+
+# Saves that only touch login bookkeeping do not change any dashboard figure
+LOGIN_BOOKKEEPING_FIELDS = {'last_login', 'last_login_ip'}
+
+
+@receiver([post_save, post_delete], sender=AUNUser)
+def user_changed(sender, instance, created=False, update_fields=None, **kwargs):
+    if update_fields and not created and set(update_fields) <= LOGIN_BOOKKEEPING_FIELDS:
+        return
+    invalidate_admin_statistics()
+
+
+@receiver([post_save, post_delete], sender=Department)
+def department_changed(sender, instance, **kwargs):
+    invalidate_admin_statistics()
+    invalidate_active_departments()
+    # Cached key statuses carry the department's active flag
+    keys = list(EvaluationKey.objects.filter(department_id=instance.pk).values_list('key', flat=True))
+    if keys:
+        EvaluationKey.objects.forget_status(*keys)
+
+
+@receiver([post_save, post_delete], sender=EvaluationKey)
+def evaluation_key_changed(sender, instance, **kwargs):
+    EvaluationKey.objects.forget_status(instance.key)
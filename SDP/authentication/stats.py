@@ -0,0 +1,67 @@
+"""
+Cached snapshot of the admin dashboard statistics.
+
+All user counts come from one conditional aggregate; the snapshot is cached for at most
+ADMIN_STATS_MAX_AGE seconds and dropped early when users or departments change.
+Login attempts are too frequent to invalidate on, so their figures are only as fresh
+as the staleness bound (or the last `refresh_dashboard_stats` run).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import AUNUser, Department, LoginAttempt
+
+ADMIN_STATS_CACHE_KEY = 'dashboard:admin-statistics'
+
+
+def compute_admin_statistics():
+    users = AUNUser.objects.aggregate(
+        total_users=Count('id'),
+        verified_users=Count('id', filter=Q(is_verified=True)),
+        active_users=Count('id', filter=Q(is_active=True)),
+    )
+    return {
+        'statistics': {
+            'total_users': users['total_users'],
+            'total_departments': Department.objects.count(),
+            'verified_users': users['verified_users'],
+            'active_users': users['active_users'],
+            'failed_logins_today': LoginAttempt.objects.filter(
+                success=False,
+                timestamp__gte=start_of_today()
+            ).count(),
+        },
+        'recent_activity': [
+            {
+                'aun_id': aun_id,
+                'success': success,
+                'timestamp': timestamp.isoformat(),
+                'ip_address': ip_address,
+            }
+            for aun_id, success, timestamp, ip_address in LoginAttempt.objects.filter(success=True)
+            .values_list('aun_id', 'success', 'timestamp', 'ip_address')[:10]
+        ],
+        'generated_at': timezone.now().isoformat(),
+    }
+
+
+def start_of_today():
+    '''Midnight in the current timezone, so "today" filters stay a plain range on the indexed column'''
+    return timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def refresh_admin_statistics():
+    snapshot = compute_admin_statistics()
+    cache.set(ADMIN_STATS_CACHE_KEY, snapshot, settings.ADMIN_STATS_MAX_AGE)
+    return snapshot
+
+
+def get_admin_statistics():
+    """Return the cached snapshot, recomputing it once it is older than the staleness bound"""
+    return cache.get(ADMIN_STATS_CACHE_KEY) or refresh_admin_statistics()
+
+
+def invalidate_admin_statistics():
+    cache.delete(ADMIN_STATS_CACHE_KEY)
@@ -1,3 +1,78 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+
+from .models import AUNUser, Department, EvaluationKey
+from .ratelimit import SlidingWindowRateLimiter
+from .utils import check_rate_limit, login_rate_limiters, record_failed_login
+
+
+class SlidingWindowRateLimiterTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.limiter = SlidingWindowRateLimiter('test', limit=3, window_seconds=60)
+        # Start on a bucket boundary so the overlap weights below are exact
+        self.now = 6000.0
+        patcher = mock.patch('authentication.ratelimit.time.time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_blocks_at_limit(self):
+        for _ in range(3):
+            self.assertTrue(self.limiter.is_allowed('1.2.3.4'))
+            self.limiter.hit('1.2.3.4')
+        self.assertFalse(self.limiter.is_allowed('1.2.3.4'))
+        self.assertTrue(self.limiter.is_allowed('5.6.7.8'))
+
+    def test_previous_bucket_is_weighted_by_overlap(self):
+        for _ in range(3):
+            self.limiter.hit('1.2.3.4')
+        self.now += 60 + 20
+        self.assertAlmostEqual(self.limiter.count('1.2.3.4'), 2.0)
+        self.assertTrue(self.limiter.is_allowed('1.2.3.4'))
+        self.now += 40
+        self.assertEqual(self.limiter.count('1.2.3.4'), 0)
+
+    def test_reset_forgets_hits(self):
+        for _ in range(3):
+            self.limiter.hit('A00012345')
+        self.limiter.reset('A00012345')
+        self.assertTrue(self.limiter.is_allowed('A00012345'))
+
+    def test_failures_recorded_in_the_checked_window(self):
+        limiters = login_rate_limiters(max_attempts=2, time_window_minutes=2)
+        for _ in range(2):
+            self.assertTrue(check_rate_limit('1.2.3.4', aun_id='A00012345', limiters=limiters))
+            record_failed_login('1.2.3.4', 'A00012345', limiters=limiters)
+        self.assertFalse(check_rate_limit('1.2.3.4', limiters=limiters))
+        self.assertFalse(check_rate_limit('9.9.9.9', aun_id='A00012345', limiters=limiters))
+
+
+class ShardedKeyConsumeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='Cafeteria', code='CAF')
+        cls.admin = AUNUser.objects.create_user('A0001', 'admin@aun.edu.ng', 'Admin', 'pw', role='admin')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_limit_holds_across_shards(self):
+        key = EvaluationKey.objects.create(
+            key='SHARDKEY', department=self.department, created_by=self.admin,
+            usage_limit=5, valid_until=timezone.now() + timedelta(days=1),
+        )
+        key.set_shard_count(2)
+
+        granted = [EvaluationKey.objects.consume('SHARDKEY', self.department.id) for _ in range(8)]
 
-# Create your tests here.
+        self.assertEqual([key_id for key_id in granted if key_id], [key.id] * 5)
+        self.assertEqual(granted[5:], [None] * 3)
+        key.refresh_from_db()
+        self.assertEqual(key.total_usage, 5)
+        self.assertEqual(sorted(key.usage_shards.values_list('used', flat=True)), [2, 3])
@@ -23,6 +23,7 @@ urlpatterns = [
     
     # Admin Views
     path('admin/users/', views.admin_user_management, name='admin_user_management'),
+    path('admin/metrics/', views.admin_request_metrics, name='admin_request_metrics'),
     
     # Role switching (if needed)
     path('switch-role/', views.switch_role_context, name='switch_role_context'),
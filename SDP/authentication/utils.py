@@ -1,60 +1,116 @@
+import json
 import random
 import string
-import hashlib
-from django.utils import timezone
 from django.conf import settings
-from .models import LoginAttempt
+from django.core.cache import cache
+from django.db import connections
+from .anonymity import ensure_pseudonym, keyed_digest
+from .models import Department, EvaluationKey, LoginAttempt
+from .audit import audit_writer
+from .ratelimit import SlidingWindowRateLimiter
 import secrets
 
 def get_client_ip(request):
-    """Get the client IP address from request"""
+    """Get the client IP address from request, trusting only TRUSTED_PROXY_COUNT proxy hops"""
+    proxies = settings.TRUSTED_PROXY_COUNT
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+    if proxies and x_forwarded_for:
+        # Each proxy appends the address it saw, so the right-most entries are trustworthy
+        hops = [hop.strip() for hop in x_forwarded_for.split(',') if hop.strip()]
+        if hops:
+            return hops[-min(proxies, len(hops))]
+    return request.META.get('REMOTE_ADDR')
 
 def log_login_attempt(aun_id, ip_address, success, user_agent='', failure_reason=''):
-    """Log login attempts for security monitoring"""
-    LoginAttempt.objects.create(
+    """Log login attempts for security monitoring (written by the background audit writer)"""
+    audit_writer.create(LoginAttempt(
         aun_id=aun_id,
         ip_address=ip_address,
         success=success,
         user_agent=user_agent,
         failure_reason=failure_reason
-    )
+    ))
+
+ACTIVE_DEPARTMENTS_CACHE_KEY = 'reference:active-departments'
+
+def get_active_departments():
+    """Active departments as plain dicts, cached until a department changes"""
+    departments = cache.get(ACTIVE_DEPARTMENTS_CACHE_KEY)
+    if departments is None:
+        departments = list(
+            Department.objects.filter(is_active=True).values('id', 'name', 'code', 'description')
+        )
+        cache.set(ACTIVE_DEPARTMENTS_CACHE_KEY, departments, None)
+    return departments
+
+async def aget_active_departments():
+    """Async version of get_active_departments() for views served under ASGI"""
+    departments = await cache.aget(ACTIVE_DEPARTMENTS_CACHE_KEY)
+    if departments is None:
+        departments = [
+            department
+            async for department in Department.objects.filter(is_active=True).values(
+                'id', 'name', 'code', 'description'
+            )
+        ]
+        await cache.aset(ACTIVE_DEPARTMENTS_CACHE_KEY, departments, None)
+    return departments
+
+def invalidate_active_departments():
+    cache.delete(ACTIVE_DEPARTMENTS_CACHE_KEY)
+
+def estimate_count(queryset):
+    """Row count for a queryset as ``(count, is_estimate)``.
+
+    On PostgreSQL this is the planner's row estimate, which costs no table scan;
+    other backends fall back to an exact COUNT(*).
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.count(), False
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    if isinstance(plan, list):
+        plan = plan[0]
+    return int(plan['Plan']['Plan Rows']), True
 
 def generate_evaluation_key(length=8):
     """Generate a unique evaluation key"""
-    # Use a combination of letters and numbers, excluding ambiguous characters
-    chars = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
-    
+    # Check a handful of candidates in one query instead of one query per attempt
     while True:
-        key = ''.join(secrets.choice(chars) for _ in range(length))
-        # Check if key already exists
-        from .models import EvaluationKey
-        if not EvaluationKey.objects.filter(key=key).exists():
-            return key
+        candidates = EvaluationKey.objects.key_candidates(8, length)
+        if candidates:
+            return candidates[0]
 
 def hash_user_identity(user):
     """Create a consistent hash for user identity (for anonymity)"""
-    identity_string = f"{user.aun_id}{user.aun_email}{timezone.now().date()}"
-    return hashlib.sha256(identity_string.encode()).hexdigest()[:16]
+    return ensure_pseudonym(user)
 
-def check_rate_limit(ip_address, max_attempts=5, time_window_minutes=15):
-    """Check if IP address has exceeded login rate limit"""
-    from datetime import timedelta
-    
-    time_threshold = timezone.now() - timedelta(minutes=time_window_minutes)
-    
-    recent_attempts = LoginAttempt.objects.filter(
-        ip_address=ip_address,
-        success=False,
-        timestamp__gte=time_threshold
-    ).count()
-    
-    return recent_attempts < max_attempts
+def login_rate_limiters(max_attempts=None, time_window_minutes=None):
+    """Failed-login limiters keyed by client IP and by AUN ID"""
+    window = 60 * (time_window_minutes or settings.LOGIN_RATE_LIMIT_WINDOW_MINUTES)
+    return (
+        SlidingWindowRateLimiter('login-ip', max_attempts or settings.LOGIN_RATE_LIMIT_IP_ATTEMPTS, window),
+        SlidingWindowRateLimiter('login-aun-id', max_attempts or settings.LOGIN_RATE_LIMIT_ACCOUNT_ATTEMPTS, window),
+    )
+
+def check_rate_limit(ip_address, max_attempts=None, time_window_minutes=None, aun_id=None, limiters=None):
+    """Check if IP address (and optionally AUN ID) has exceeded login rate limit"""
+    by_ip, by_account = limiters or login_rate_limiters(max_attempts, time_window_minutes)
+    if not by_ip.is_allowed(ip_address):
+        return False
+    return not aun_id or by_account.is_allowed(aun_id)
+
+def record_failed_login(ip_address, aun_id=None, time_window_minutes=None, limiters=None):
+    """Count a failed login against the IP and AUN ID limiters"""
+    # Hits must land in the buckets check_rate_limit reads, i.e. use the same window
+    by_ip, by_account = limiters or login_rate_limiters(time_window_minutes=time_window_minutes)
+    by_ip.hit(ip_address)
+    if aun_id:
+        by_account.hit(aun_id)
+
+def clear_failed_logins(aun_id, limiters=None):
+    """Forget an account's failures after a successful login"""
+    _, by_account = limiters or login_rate_limiters()
+    by_account.reset(aun_id)
 
 def sanitize_user_agent(user_agent):
     """Sanitize user agent string for storage"""
@@ -114,11 +170,8 @@ def is_strong_password(password):
     return True, "Password is strong."
 
 def encrypt_for_anonymity(data, user_id):
-    """Simple encryption for user anonymity"""
-    # This is a basic implementation - in production, use proper encryption
-    key = hashlib.sha256(f"{settings.SECRET_KEY}{user_id}".encode()).digest()[:16]
-    # For now, just return a hash - implement proper encryption as needed
-    return hashlib.sha256(f"{data}{key.hex()}".encode()).hexdigest()[:16]
+    """Keyed pseudonym for arbitrary per-user data, under the same key as evaluation pseudonyms"""
+    return keyed_digest(f"{user_id}:{data}")
 
 def clean_session_data(request):
     """Clean up session data on logout"""
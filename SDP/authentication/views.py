@@ -4,7 +4,9 @@ from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from django.conf import settings
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from django.core.exceptions import ValidationError
 from django.db import transaction, models
 from django.core.serializers import serialize
@@ -19,10 +21,17 @@ import json
 import uuid
 from datetime import timedelta
 
-from .models import AUNUser, Department, EvaluationKey, UserSession, LoginAttempt
+from .models import AUNUser, Department, EvaluationKey, UserSession
 from .forms import AUNLoginForm, UserRegistrationForm, ProfileUpdateForm
-from .utils import get_client_ip, log_login_attempt, generate_evaluation_key
+from .utils import (
+    get_client_ip, log_login_attempt, generate_evaluation_key,
+    check_rate_limit, record_failed_login, clear_failed_logins, login_rate_limiters, get_active_departments,
+    aget_active_departments, estimate_count,
+)
+from .stats import get_admin_statistics
 from .decorators import ajax_login_required, ajax_role_required
+from .audit import audit_writer
+from backend.middleware import registry as request_metrics, metrics_setting
 
 @extend_schema(
     tags=['Authentication'],
@@ -92,6 +101,17 @@ from .decorators import ajax_login_required, ajax_role_required
                     }
                 }
             }
+        },
+        429: {
+            'description': 'Too many failed attempts from this IP or for this AUN ID',
+            'content': {
+                'application/json': {
+                    'example': {
+                        'success': False,
+                        'message': 'Too many failed attempts. Please try again after 15 minutes.'
+                    }
+                }
+            }
         }
     }
 )
@@ -111,28 +131,38 @@ def login_view(request):
                 'message': 'AUN ID and password are required.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        # Throttle repeated failures per IP and per account (cache counters, no DB query)
+        client_ip = get_client_ip(request)
+        limiters = getattr(request, 'login_rate_limiters', None) or login_rate_limiters()
+        if not check_rate_limit(client_ip, aun_id=aun_id, limiters=limiters):
+            log_login_attempt(aun_id, client_ip, False, request.META.get('HTTP_USER_AGENT', ''), 'Rate limited')
+            return Response({
+                'success': False,
+                'message': f'Too many failed attempts. Please try again after {limiters[0].window // 60} minutes.'
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        
         # Authenticate user
         user = authenticate(request, username=aun_id, password=password)
         
         if user is not None:
             if user.is_verified:
-                # Log successful login
-                log_login_attempt(aun_id, get_client_ip(request), True, request.META.get('HTTP_USER_AGENT', ''))
+                clear_failed_logins(aun_id, limiters)
+                
+                # Log user in
+                login(request, user)
                 
-                # Create user session record
-                session_record = UserSession.objects.create(
+                # Audit rows are queued; the background writer batches them
+                log_login_attempt(aun_id, client_ip, True, request.META.get('HTTP_USER_AGENT', ''))
+                audit_writer.create(UserSession(
                     user=user,
                     session_key=request.session.session_key or str(uuid.uuid4()),
-                    ip_address=get_client_ip(request),
+                    ip_address=client_ip,
                     user_agent=request.META.get('HTTP_USER_AGENT', '')
-                )
+                ))
                 
                 # Update last login IP
-                user.last_login_ip = get_client_ip(request)
-                user.save(update_fields=['last_login_ip'])
-                
-                # Log user in
-                login(request, user)
+                user.last_login_ip = client_ip
+                audit_writer.update(AUNUser, user.pk, last_login_ip=client_ip)
                 
                 # Set session data
                 request.session['user_role'] = user.role
@@ -168,7 +198,8 @@ def login_view(request):
                 }, status=status.HTTP_403_FORBIDDEN)
         else:
             # Log failed login
-            log_login_attempt(aun_id, get_client_ip(request), False, request.META.get('HTTP_USER_AGENT', ''), 'Invalid credentials')
+            record_failed_login(client_ip, aun_id, limiters=limiters)
+            log_login_attempt(aun_id, client_ip, False, request.META.get('HTTP_USER_AGENT', ''), 'Invalid credentials')
             return Response({
                 'success': False,
                 'message': 'Invalid AUN ID or password.'
@@ -239,15 +270,7 @@ def dashboard(request):
                 'major': user.major,
                 'position': user.position,
             },
-            'departments': [
-                {
-                    'id': dept.id,
-                    'name': dept.name,
-                    'code': dept.code,
-                    'description': dept.description
-                }
-                for dept in Department.objects.filter(is_active=True)
-            ]
+            'departments': get_active_departments()
         }
         
         if user.is_student:
@@ -287,29 +310,14 @@ def dashboard(request):
             dashboard_data['role_specific'] = role_data
         
         elif user.is_admin:
-            # Admin dashboard data
+            # Admin dashboard data (cached snapshot, see authentication.stats)
+            snapshot = get_admin_statistics()
             dashboard_data.update({
                 'role_specific': {
                     'type': 'admin',
-                    'statistics': {
-                        'total_users': AUNUser.objects.count(),
-                        'total_departments': Department.objects.count(),
-                        'verified_users': AUNUser.objects.filter(is_verified=True).count(),
-                        'active_users': AUNUser.objects.filter(is_active=True).count(),
-                        'failed_logins_today': LoginAttempt.objects.filter(
-                            success=False,
-                            timestamp__date=timezone.now().date()
-                        ).count(),
-                    },
-                    'recent_activity': [
-                        {
-                            'aun_id': attempt.aun_id,
-                            'success': attempt.success,
-                            'timestamp': attempt.timestamp.isoformat(),
-                            'ip_address': attempt.ip_address,
-                        }
-                        for attempt in LoginAttempt.objects.filter(success=True)[:10]
-                    ],
+                    'statistics': snapshot['statistics'],
+                    'recent_activity': snapshot['recent_activity'],
+                    'statistics_generated_at': snapshot['generated_at'],
                     'permissions': {
                         'can_manage_users': True,
                         'can_manage_departments': True,
@@ -429,6 +437,8 @@ def profile_view(request):
             'message': 'An error occurred while processing your request.'
         }, status=500)
 
+MAX_MINTED_KEYS = 1000
+
 @ajax_role_required(['admin', 'department_head'])
 @require_http_methods(["GET", "POST"])
 def manage_evaluation_keys(request):
@@ -466,7 +476,7 @@ def manage_evaluation_keys(request):
                         },
                         'created_by': key.created_by.full_name,
                         'is_active': key.is_active,
-                        'usage_count': key.usage_count,
+                        'usage_count': key.total_usage,
                         'usage_limit': key.usage_limit,
                         'valid_from': key.valid_from.isoformat(),
                         'valid_until': key.valid_until.isoformat(),
@@ -502,6 +512,7 @@ def manage_evaluation_keys(request):
                 description = data.get('description', '')
                 usage_limit = int(data.get('usage_limit', 100))
                 valid_days = int(data.get('valid_days', 30))
+                shard_count = int(data.get('shard_count', 0))
                 
                 try:
                     department = Department.objects.get(id=department_id, is_active=True)
@@ -525,6 +536,8 @@ def manage_evaluation_keys(request):
                         usage_limit=usage_limit,
                         valid_until=valid_until
                     )
+                    if shard_count > 0:
+                        eval_key.set_shard_count(min(shard_count, 64))
                     
                     return JsonResponse({
                         'success': True,
@@ -553,6 +566,67 @@ def manage_evaluation_keys(request):
                         'message': 'Invalid numeric values provided.'
                     }, status=400)
             
+            elif action == 'mint_keys':
+                department_id = data.get('department_id')
+                labels = data.get('labels')
+                try:
+                    if labels is None:
+                        count = int(data.get('count', 0))
+                        # Range-checked first, so an oversized count is never allocated
+                        if 0 < count <= MAX_MINTED_KEYS:
+                            labels = [data.get('description', '')] * count
+                    if not isinstance(labels, list) or not 0 < len(labels) <= MAX_MINTED_KEYS:
+                        return JsonResponse({
+                            'success': False,
+                            'message': f'Provide between 1 and {MAX_MINTED_KEYS} keys to mint.'
+                        }, status=400)
+                    usage_limit = int(data.get('usage_limit', 100))
+                    valid_days = int(data.get('valid_days', 30))
+                    shard_count = min(int(data.get('shard_count', 0)), 64)
+                    department = Department.objects.get(id=department_id, is_active=True)
+                except Department.DoesNotExist:
+                    return JsonResponse({
+                        'success': False,
+                        'message': 'Invalid department selected.'
+                    }, status=400)
+                except (TypeError, ValueError):
+                    return JsonResponse({
+                        'success': False,
+                        'message': 'Invalid numeric values provided.'
+                    }, status=400)
+
+                if not user.is_admin and user.department != department:
+                    return JsonResponse({
+                        'success': False,
+                        'message': 'You do not have permission to create keys for this department.'
+                    }, status=403)
+
+                keys = EvaluationKey.objects.mint(
+                    department,
+                    user,
+                    [str(label) for label in labels],
+                    valid_until=timezone.now() + timedelta(days=valid_days),
+                    usage_limit=usage_limit,
+                    shard_count=max(shard_count, 0),
+                )
+                return JsonResponse({
+                    'success': True,
+                    'message': f'{len(keys)} evaluation keys created successfully!',
+                    'data': {
+                        'department': {
+                            'id': department.id,
+                            'name': department.name,
+                            'code': department.code
+                        },
+                        'valid_until': keys[0].valid_until.isoformat(),
+                        'usage_limit': usage_limit,
+                        'keys': [
+                            {'id': key.id, 'key': key.key, 'description': key.description}
+                            for key in keys
+                        ]
+                    }
+                }, status=201)
+
             elif action == 'deactivate_key':
                 key_id = data.get('key_id')
                 try:
@@ -598,8 +672,8 @@ def manage_evaluation_keys(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def validate_evaluation_key(request):
-    """AJAX endpoint to validate evaluation keys"""
+async def validate_evaluation_key(request):
+    """AJAX endpoint to validate evaluation keys (async, served under ASGI)"""
     try:
         data = json.loads(request.body)
         key = data.get('key', '').strip().upper()
@@ -611,36 +685,40 @@ def validate_evaluation_key(request):
                 'message': 'Key and department are required.'
             })
         
-        try:
-            department = Department.objects.get(id=department_id, is_active=True)
-            eval_key = EvaluationKey.objects.get(
-                key=key,
-                department=department
-            )
-            
-            if eval_key.is_valid:
-                return JsonResponse({
-                    'valid': True,
-                    'message': 'Valid evaluation key.',
-                    'key_info': {
-                        'description': eval_key.description,
-                        'usage_count': eval_key.usage_count,
-                        'usage_limit': eval_key.usage_limit,
-                        'valid_until': eval_key.valid_until.isoformat()
-                    }
-                })
-            else:
-                reason = 'Key has expired or reached usage limit.'
-                return JsonResponse({
-                    'valid': False,
-                    'message': reason
-                })
-                
-        except (Department.DoesNotExist, EvaluationKey.DoesNotExist):
+        # Served from the key status cache; unknown keys are cached as misses too
+        key_status = await EvaluationKey.objects.acached_status(key)
+        if (
+            key_status is None
+            or str(key_status['department_id']) != str(department_id)
+            or not key_status['department_active']
+        ):
             return JsonResponse({
                 'valid': False,
                 'message': 'Invalid evaluation key for this department.'
             })
+        
+        now = timezone.now()
+        if (
+            key_status['is_active']
+            and key_status['valid_from'] <= now <= key_status['valid_until']
+            and key_status['usage_count'] < key_status['usage_limit']
+        ):
+            return JsonResponse({
+                'valid': True,
+                'message': 'Valid evaluation key.',
+                'key_info': {
+                    'description': key_status['description'],
+                    'usage_count': key_status['usage_count'],
+                    'usage_limit': key_status['usage_limit'],
+                    'valid_until': key_status['valid_until'].isoformat()
+                }
+            })
+        else:
+            reason = 'Key has expired or reached usage limit.'
+            return JsonResponse({
+                'valid': False,
+                'message': reason
+            })
             
     except json.JSONDecodeError:
         return JsonResponse({
@@ -653,22 +731,32 @@ def validate_evaluation_key(request):
             'message': 'An error occurred while validating the key.'
         })
 
+ADMIN_USERS_PAGE_SIZE = 20
+ADMIN_USERS_MAX_PAGE_SIZE = 100
+
 @ajax_role_required(['admin'])
 @require_http_methods(["GET", "POST", "PUT", "PATCH"])
 def admin_user_management(request):
     """API endpoint for admin user management"""
     try:
         if request.method == 'GET':
-            # Return users data with pagination support
-            page = int(request.GET.get('page', 1))
-            page_size = int(request.GET.get('page_size', 20))
-            search = request.GET.get('search', '')
+            # Keyset pagination: newest users first, ``cursor`` is the last id of the previous page
+            try:
+                page_size = min(max(int(request.GET.get('page_size', ADMIN_USERS_PAGE_SIZE)), 1), ADMIN_USERS_MAX_PAGE_SIZE)
+                cursor = int(request.GET['cursor']) if request.GET.get('cursor') else None
+            except ValueError:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'page_size and cursor must be integers.'
+                }, status=400)
+            search = request.GET.get('search', '').strip()
             role_filter = request.GET.get('role', '')
             department_filter = request.GET.get('department', '')
+            include_total = request.GET.get('include_total', '').lower() in ('1', 'true', 'yes')
             
-            users_query = AUNUser.objects.all().select_related('department')
+            users_query = AUNUser.objects.all()
             
-            # Apply filters
+            # Apply filters (icontains is served by the pg_trgm indexes on PostgreSQL)
             if search:
                 users_query = users_query.filter(
                     models.Q(aun_id__icontains=search) |
@@ -682,11 +770,18 @@ def admin_user_management(request):
             if department_filter:
                 users_query = users_query.filter(department_id=department_filter)
             
-            # Pagination
-            total_users = users_query.count()
-            start_index = (page - 1) * page_size
-            end_index = start_index + page_size
-            users = users_query[start_index:end_index]
+            page_query = users_query.select_related('department').order_by('-id')
+            if cursor is not None:
+                page_query = page_query.filter(id__lt=cursor)
+            users = list(page_query[:page_size + 1])
+            has_next = len(users) > page_size
+            users = users[:page_size]
+            
+            # Exact counts scan every matching row; the planner estimate is free
+            if include_total:
+                total_users, total_is_estimate = users_query.count(), False
+            else:
+                total_users, total_is_estimate = estimate_count(users_query)
             
             users_data = {
                 'users': [
@@ -711,25 +806,16 @@ def admin_user_management(request):
                     }
                     for user in users
                 ],
-                'departments': [
-                    {
-                        'id': dept.id,
-                        'name': dept.name,
-                        'code': dept.code
-                    }
-                    for dept in Department.objects.filter(is_active=True)
-                ],
                 'user_roles': [
                     {'value': role[0], 'label': role[1]}
                     for role in AUNUser.USER_ROLES
                 ],
                 'pagination': {
-                    'current_page': page,
                     'page_size': page_size,
+                    'next_cursor': str(users[-1].id) if has_next else None,
+                    'has_next': has_next,
                     'total_users': total_users,
-                    'total_pages': (total_users + page_size - 1) // page_size,
-                    'has_next': end_index < total_users,
-                    'has_previous': page > 1
+                    'total_is_estimate': total_is_estimate,
                 }
             }
             
@@ -839,6 +925,29 @@ def admin_user_management(request):
             'message': 'An error occurred while processing your request.'
         }, status=500)
 
+@ajax_role_required(['admin'])
+@require_http_methods(["GET", "DELETE"])
+def admin_request_metrics(request):
+    """API endpoint exposing per-view request cost aggregates (DELETE resets them)"""
+    if request.method == 'DELETE':
+        request_metrics.reset()
+        return JsonResponse({
+            'success': True,
+            'message': 'Request metrics reset.'
+        })
+    
+    views = request_metrics.snapshot()
+    return JsonResponse({
+        'success': True,
+        'data': {
+            'views': views,
+            'settings': {
+                name: metrics_setting(name)
+                for name in ('ENABLED', 'SAMPLE_RATE', 'SLOW_REQUEST_MS', 'N_PLUS_ONE_THRESHOLD')
+            },
+        }
+    })
+
 @ajax_login_required
 @require_http_methods(["GET"])  
 def switch_role_context(request):
@@ -1107,69 +1216,28 @@ def register_view(request):
             'message': 'An error occurred during registration.'
         }, status=500)
 
-@extend_schema(
-    tags=['Public'],
-    summary='Get Departments List',
-    description='Get list of all active departments available for registration and evaluation',
-    responses={
-        200: {
-            'description': 'Departments retrieved successfully',
-            'content': {
-                'application/json': {
-                    'example': {
-                        'success': True,
-                        'data': {
-                            'departments': [
-                                {
-                                    'id': 1,
-                                    'name': 'Computer Science',
-                                    'code': 'CS',
-                                    'description': 'Department of Computer Science'
-                                },
-                                {
-                                    'id': 2,
-                                    'name': 'Business Administration',
-                                    'code': 'BA',
-                                    'description': 'Department of Business Administration'
-                                }
-                            ],
-                            'count': 2
-                        }
-                    }
-                }
-            }
-        }
-    }
-)
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def departments_list(request):
-    """API endpoint to get list of active departments for registration"""
+@require_http_methods(["GET"])
+async def departments_list(request):
+    """API endpoint to get list of active departments for registration (async, served under ASGI)"""
     try:
-        departments = Department.objects.filter(is_active=True)
-        departments_data = [
-            {
-                'id': dept.id,
-                'name': dept.name,
-                'code': dept.code,
-                'description': dept.description
-            }
-            for dept in departments
-        ]
+        # Reference data: cached until a department changes, and cacheable by browsers
+        departments_data = await aget_active_departments()
         
-        return Response({
+        response = JsonResponse({
             'success': True,
             'data': {
                 'departments': departments_data,
                 'count': len(departments_data)
             }
-        }, status=status.HTTP_200_OK)
+        })
+        patch_cache_control(response, public=True, max_age=settings.REFERENCE_DATA_MAX_AGE)
+        return response
         
     except Exception as e:
-        return Response({
+        return JsonResponse({
             'success': False,
             'message': 'An error occurred while fetching departments.'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        }, status=500)
 
 @require_http_methods(["GET"])
 def api_documentation(request):
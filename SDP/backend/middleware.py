@@ -0,0 +1,328 @@
+"""
+Project-wide middleware: per-request cost instrumentation and primary pinning.
+
+RequestMetricsMiddleware samples requests, times them, counts their SQL queries and
+folds the result into an in-process registry keyed by view name (e.g.
+``evaluations:submit_evaluation``). Repeated executions of the same SQL template
+within one request are reported as likely N+1 patterns. Streamed responses are
+recorded once their last chunk has been produced, so queries made while streaming
+(e.g. CSV exports) are counted.
+
+ReadYourWritesMiddleware pins clients that wrote to the primary database (see
+backend.routers). Every middleware here runs natively under WSGI and ASGI.
+"""
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import routers
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 1.0,
+    'SLOW_REQUEST_MS': 500,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'SERVER_TIMING': True,
+    'RECENT_SAMPLES': 200,
+}
+
+# Statements that open or close a transaction or savepoint; not candidates for N+1
+TRANSACTION_CONTROL = ('BEGIN', 'START TRANSACTION', 'SAVEPOINT', 'RELEASE', 'COMMIT', 'ROLLBACK')
+
+
+def metrics_setting(name):
+    return getattr(settings, 'REQUEST_METRICS', {}).get(name, DEFAULTS[name])
+
+
+class QueryRecorder:
+    """execute_wrapper that times queries and counts repeated statements"""
+
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.templates = Counter()
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.count += 1
+            if not sql.lstrip().upper().startswith(TRANSACTION_CONTROL):
+                self.templates[sql] += 1
+                if not many:
+                    self.statements[(sql, repr(params))] += 1
+
+    @property
+    def duplicates(self):
+        """Statements re-run with identical parameters"""
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+    def n_plus_one(self, threshold):
+        """SQL templates executed at least ``threshold`` times"""
+        return {sql: n for sql, n in self.templates.items() if n >= threshold}
+
+
+class MetricsRegistry:
+    """Thread-safe per-view aggregates"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, wall_ms, db_ms, queries, duplicates, n_plus_one, slow):
+        with self._lock:
+            stats = self._views.get(view_name)
+            if stats is None:
+                stats = self._views[view_name] = {
+                    'requests': 0,
+                    'slow_requests': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'db_ms': 0.0,
+                    'queries': 0,
+                    'max_queries': 0,
+                    'duplicate_queries': 0,
+                    'n_plus_one_requests': 0,
+                    'n_plus_one_examples': {},
+                    'recent_ms': deque(maxlen=metrics_setting('RECENT_SAMPLES')),
+                }
+            stats['requests'] += 1
+            stats['slow_requests'] += int(slow)
+            stats['total_ms'] += wall_ms
+            stats['max_ms'] = max(stats['max_ms'], wall_ms)
+            stats['db_ms'] += db_ms
+            stats['queries'] += queries
+            stats['max_queries'] = max(stats['max_queries'], queries)
+            stats['duplicate_queries'] += duplicates
+            stats['recent_ms'].append(wall_ms)
+            if n_plus_one:
+                stats['n_plus_one_requests'] += 1
+                for sql, count in n_plus_one.items():
+                    key = sql[:300]
+                    stats['n_plus_one_examples'][key] = max(stats['n_plus_one_examples'].get(key, 0), count)
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for view_name, stats in self._views.items():
+                recent = sorted(stats['recent_ms'])
+                n = stats['requests']
+                result[view_name] = {
+                    'requests': n,
+                    'slow_requests': stats['slow_requests'],
+                    'mean_ms': round(stats['total_ms'] / n, 2),
+                    'p95_ms': round(recent[int(0.95 * (len(recent) - 1))], 2) if recent else None,
+                    'max_ms': round(stats['max_ms'], 2),
+                    'mean_db_ms': round(stats['db_ms'] / n, 2),
+                    'mean_queries': round(stats['queries'] / n, 2),
+                    'max_queries': stats['max_queries'],
+                    'duplicate_queries': stats['duplicate_queries'],
+                    'n_plus_one_requests': stats['n_plus_one_requests'],
+                    'n_plus_one_examples': dict(stats['n_plus_one_examples']),
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+class RequestMetricsMiddleware:
+    """Record wall time, DB time and query counts for a sample of requests"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        stack = self.recording(recorder)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            stack.close()
+            raise
+        if self.streams(response):
+            return self.record_stream(request, response, recorder, started, stack)
+        stack.close()
+        return self.finish(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        # Connections are thread-local: the async ORM queries from the request's
+        # thread-sensitive worker thread, so the wrappers are installed there
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        stack = await sync_to_async(self.recording)(recorder)
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            await sync_to_async(stack.close)()
+            raise
+        if self.streams(response):
+            return self.record_stream(request, response, recorder, started, stack)
+        await sync_to_async(stack.close)()
+        return self.finish(request, response, recorder, started)
+
+    @staticmethod
+    def sampled():
+        return metrics_setting('ENABLED') and random.random() < metrics_setting('SAMPLE_RATE')
+
+    @staticmethod
+    def recording(recorder):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        return stack
+
+    @staticmethod
+    def streams(response):
+        # FileResponse bodies may bypass streaming_content (wsgi.file_wrapper) and make no queries
+        return response.streaming and getattr(response, 'file_to_stream', None) is None
+
+    def record_stream(self, request, response, recorder, started, stack):
+        """Keep recording while the body streams; headers are already sent, so no Server-Timing"""
+        content = response.streaming_content
+
+        # The server consumes the body on the thread the wrappers were installed on
+        def stream():
+            try:
+                yield from content
+            finally:
+                stack.close()
+                self.record(request, recorder, started)
+
+        async def astream():
+            try:
+                async for chunk in content:
+                    yield chunk
+            finally:
+                await sync_to_async(stack.close)()
+                self.record(request, recorder, started)
+
+        response.streaming_content = astream() if response.is_async else stream()
+        return response
+
+    def finish(self, request, response, recorder, started):
+        wall_ms, db_ms = self.record(request, recorder, started)
+        if metrics_setting('SERVER_TIMING'):
+            response['Server-Timing'] = (
+                f'total;dur={wall_ms:.1f}, db;dur={db_ms:.1f};desc="{recorder.count} queries"'
+            )
+        return response
+
+    def record(self, request, recorder, started):
+        """Fold a finished request into the registry; returns (wall_ms, db_ms)"""
+        wall_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.db_seconds * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = (match.view_name if match else None) or 'unresolved'
+        n_plus_one = recorder.n_plus_one(metrics_setting('N_PLUS_ONE_THRESHOLD'))
+        slow = wall_ms >= metrics_setting('SLOW_REQUEST_MS')
+        registry.record(view_name, wall_ms, db_ms, recorder.count, recorder.duplicates, n_plus_one, slow)
+
+        if slow or n_plus_one:
+            logger.warning(
+                '%s %s -> %s: %.1fms, %d queries (%.1fms db), %d duplicates%s',
+                request.method, request.path, view_name, wall_ms, recorder.count, db_ms,
+                recorder.duplicates, ', possible N+1' if n_plus_one else '',
+            )
+        return wall_ms, db_ms
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise with an async path, so under ASGI the middleware chain stays async end to
+    end instead of hopping into a thread for every API request. Static files are still
+    served by WhiteNoise's own (sync) file response.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Track whether a request wrote to the primary and, if so, pin the client to it for
+    DATABASE_REPLICA_PIN_SECONDS so replica-routed reads cannot miss its own writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = routers.begin_request()
+        return self.pin(self.get_response(request), state)
+
+    async def __acall__(self, request):
+        state = routers.begin_request()
+        return self.pin(await self.get_response(request), state)
+
+    @staticmethod
+    def pin(response, state):
+        if state['wrote'] and routers.replica_configured():
+            seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+            response.set_cookie(
+                routers.PIN_COOKIE_NAME,
+                str(time.time() + seconds),
+                max_age=seconds,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
@@ -0,0 +1,130 @@
+"""
+Primary/replica database routing.
+
+Only views wrapped in ``read_from_replica`` read from the ``replica`` alias; everything
+else (writes, management commands, unmarked views) stays on ``default``. A client that
+wrote to the primary is pinned to it for ``DATABASE_REPLICA_PIN_SECONDS`` through a
+cookie set by ``ReadYourWritesMiddleware``, so it never reads a replica that has not
+caught up with its own writes yet. Without a ``replica`` database configured the
+router and decorator are no-ops.
+"""
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_DB_ALIAS = 'replica'
+PIN_COOKIE_NAME = 'db_primary_pin'
+
+_use_replica = ContextVar('use_replica', default=False)
+# Mutable per-request state, so writes made in async ORM worker threads are seen too
+_request_state = ContextVar('db_request_state', default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def begin_request():
+    """Start tracking writes for the current request; returns its state dict."""
+    state = {'wrote': False}
+    _request_state.set(state)
+    return state
+
+
+def pinned_to_primary(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE_NAME, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _stream_from_replica(content):
+    previous = _use_replica.get()
+    _use_replica.set(True)
+    try:
+        yield from content
+    finally:
+        _use_replica.set(previous)
+
+
+async def _astream_from_replica(content):
+    previous = _use_replica.get()
+    _use_replica.set(True)
+    try:
+        async for chunk in content:
+            yield chunk
+    finally:
+        _use_replica.set(previous)
+
+
+def read_from_replica(view_func):
+    """Serve the view's reads (including streamed content) from the replica unless pinned."""
+    def use_replica(request):
+        return replica_configured() and not pinned_to_primary(request)
+
+    def streamed(response):
+        # Streaming bodies are produced after the view returns
+        if getattr(response, 'streaming', False):
+            if response.is_async:
+                response.streaming_content = _astream_from_replica(response.streaming_content)
+            else:
+                response.streaming_content = _stream_from_replica(response.streaming_content)
+        return response
+
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _async_wrapped_view(request, *args, **kwargs):
+            if not use_replica(request):
+                return await view_func(request, *args, **kwargs)
+            token = _use_replica.set(True)
+            try:
+                return streamed(await view_func(request, *args, **kwargs))
+            finally:
+                _use_replica.reset(token)
+        return _async_wrapped_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not use_replica(request):
+            return view_func(request, *args, **kwargs)
+        token = _use_replica.set(True)
+        try:
+            return streamed(view_func(request, *args, **kwargs))
+        finally:
+            _use_replica.reset(token)
+    return _wrapped_view
+
+
+class PrimaryReplicaRouter:
+    """Route marked reads to the replica; every write goes to (and pins) the primary."""
+
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get() or not replica_configured():
+            return None
+        state = _request_state.get()
+        if state is not None and state['wrote']:
+            # Read-your-writes within the same request
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema through replication
+        if db == REPLICA_DB_ALIAS:
+            return False
+        return None
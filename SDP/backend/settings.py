@@ -50,8 +50,10 @@ AUTH_USER_MODEL = 'authentication.AUNUser'
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware (should be at the top)
+    'backend.middleware.RequestMetricsMiddleware',  # Per-view latency/query metrics
+    'backend.middleware.ReadYourWritesMiddleware',  # Pins writers to the primary database
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Whitenoise for static files
+    'backend.middleware.AsyncWhiteNoiseMiddleware',  # Whitenoise for static files (async-capable)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -60,6 +62,16 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request cost instrumentation (backend.middleware). Aggregates are served to admins
+# at /auth/admin/metrics/; keep SAMPLE_RATE low in production.
+REQUEST_METRICS = {
+    'ENABLED': os.environ.get('REQUEST_METRICS_ENABLED', 'True') == 'True',
+    'SAMPLE_RATE': float(os.environ.get('REQUEST_METRICS_SAMPLE_RATE', '1.0' if DEBUG else '0.05')),
+    'SLOW_REQUEST_MS': float(os.environ.get('REQUEST_METRICS_SLOW_MS', 500)),
+    'N_PLUS_ONE_THRESHOLD': int(os.environ.get('REQUEST_METRICS_N_PLUS_ONE', 5)),
+    'SERVER_TIMING': os.environ.get('REQUEST_METRICS_SERVER_TIMING', 'True') == 'True',
+}
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -86,6 +98,14 @@ load_dotenv()
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Connection reuse: every new connection to the database pays a TCP + TLS handshake.
+# By default each worker keeps its connection for DB_CONN_MAX_AGE seconds and checks it
+# is still alive before reusing it. DB_POOL=True instead shares a psycopg 3 pool per
+# process (Django requires CONN_MAX_AGE=0 then); use it under ASGI, where persistent
+# connections are not reused between requests.
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi')
+DB_POOL = os.environ.get('DB_POOL', 'False') == 'True'
+
 # Supabase Database Configuration
 DATABASES = {
     'default': {
@@ -95,11 +115,53 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD'),
         'HOST': os.environ.get('DB_HOST'),
         'PORT': os.environ.get('DB_PORT'),
+        'CONN_MAX_AGE': 0 if DB_POOL or SERVER_MODE == 'asgi' else int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        # Transaction-mode poolers (Supabase port 6543) cannot hold server-side cursors
+        'DISABLE_SERVER_SIDE_CURSORS': os.environ.get(
+            'DB_DISABLE_SERVER_SIDE_CURSORS', str(os.environ.get('DB_PORT') == '6543')
+        ) == 'True',
         'OPTIONS': {
-            'sslmode': 'require',
+            'sslmode': os.environ.get('DB_SSLMODE', 'require'),
         },
+        # Build the test database from the models rather than replaying every migration
+        'TEST': {'MIGRATE': False},
+    }
+}
+
+# Pooled connections are health-checked on checkout when CONN_HEALTH_CHECKS is on
+if DB_POOL:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+        # Seconds a request waits for a free connection before failing
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+        'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800)),
     }
+
+# Read replica (optional). Setting any DB_REPLICA_* variable adds a 'replica' alias with
+# the primary's settings plus these overrides; views marked with
+# backend.routers.read_from_replica then read from it, except for clients that wrote to
+# the primary within the last DATABASE_REPLICA_PIN_SECONDS.
+DB_REPLICA_OVERRIDES = {
+    setting: os.environ[f'DB_REPLICA_{setting}']
+    for setting in ('NAME', 'USER', 'PASSWORD', 'HOST', 'PORT')
+    if f'DB_REPLICA_{setting}' in os.environ
 }
+if DB_REPLICA_OVERRIDES:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        **DB_REPLICA_OVERRIDES,
+        'DISABLE_SERVER_SIDE_CURSORS': os.environ.get(
+            'DB_DISABLE_SERVER_SIDE_CURSORS',
+            str(DB_REPLICA_OVERRIDES.get('PORT', DATABASES['default']['PORT']) == '6543'),
+        ) == 'True',
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['backend.routers.PrimaryReplicaRouter']
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get('DATABASE_REPLICA_PIN_SECONDS', 15))
 
 # Alternative SQLite configuration for local development
 # Using SQLite for local development without Supabase
@@ -111,7 +173,39 @@ DATABASES = {
 # }
 
 
-# Password validation
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Defaults to per-process memory. Point CACHE_BACKEND/CACHE_LOCATION at a shared store
+# (e.g. django.core.cache.backends.redis.RedisCache + redis://host:6379/0, or
+# django.core.cache.backends.filebased.FileBasedCache + a directory) when running
+# several workers so invalidations reach all of them.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'aun-evaluation'),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),
+    }
+}
+
+# Admin dashboard statistics snapshot (authentication.stats): maximum age in seconds
+ADMIN_STATS_MAX_AGE = int(os.environ.get('ADMIN_STATS_MAX_AGE', 60))
+
+# Evaluation key status cache used by /auth/validate-key/ (seconds). Unknown keys are
+# remembered for the shorter miss TTL; used, edited or new keys are invalidated on commit.
+EVALUATION_KEY_STATUS_TTL = int(os.environ.get('EVALUATION_KEY_STATUS_TTL', 300))
+EVALUATION_KEY_MISS_TTL = int(os.environ.get('EVALUATION_KEY_MISS_TTL', 30))
+
+# Public question list cache (evaluations.cache)
+QUESTION_CACHE_TIMEOUT = int(os.environ.get('QUESTION_CACHE_TIMEOUT', 300))
+QUESTION_CACHE_LRU_SIZE = int(os.environ.get('QUESTION_CACHE_LRU_SIZE', 256))
+
+# Idempotency-Key replay store for start/submit (evaluations.idempotency): cache alias and
+# how long (seconds) a key's response is kept. Use a shared CACHE_BACKEND with several workers.
+IDEMPOTENCY_CACHE_ALIAS = os.environ.get('IDEMPOTENCY_CACHE_ALIAS', 'default')
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 86400))
+
+# Browser/CDN max-age (seconds) for reference data endpoints such as /auth/departments/
+REFERENCE_DATA_MAX_AGE = int(os.environ.get('REFERENCE_DATA_MAX_AGE', 300))
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -175,6 +269,43 @@ CSRF_TRUSTED_ORIGINS = os.environ.get(
     'http://localhost:5173,http://127.0.0.1:5173'
 ).split(',')
 
+# Failed-login rate limiting (authentication.ratelimit, counters kept in the cache).
+# The per-IP budget is larger because campus traffic shares a few NAT addresses.
+LOGIN_RATE_LIMIT_WINDOW_MINUTES = int(os.environ.get('LOGIN_RATE_LIMIT_WINDOW_MINUTES', 15))
+LOGIN_RATE_LIMIT_ACCOUNT_ATTEMPTS = int(os.environ.get('LOGIN_RATE_LIMIT_ACCOUNT_ATTEMPTS', 5))
+LOGIN_RATE_LIMIT_IP_ATTEMPTS = int(os.environ.get('LOGIN_RATE_LIMIT_IP_ATTEMPTS', 50))
+
+# Reverse proxies in front of the app that append to X-Forwarded-For (Render's router
+# is one). The client address is the hop the outermost of them recorded; anything to
+# its left is client-supplied. Set to 0 when the app is reached directly.
+TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 1))
+
+# Audit log writes (LoginAttempt, UserSession) are batched off the request path by
+# authentication.audit; set AUDIT_LOG_ASYNC=False to write them inline.
+AUDIT_LOG = {
+    'ASYNC': os.environ.get('AUDIT_LOG_ASYNC', 'True') == 'True',
+    'BATCH_SIZE': int(os.environ.get('AUDIT_LOG_BATCH_SIZE', 200)),
+    'FLUSH_INTERVAL_MS': int(os.environ.get('AUDIT_LOG_FLUSH_INTERVAL_MS', 250)),
+    'MAX_QUEUE': int(os.environ.get('AUDIT_LOG_MAX_QUEUE', 10000)),
+}
+
+# Evaluation pseudonyms (authentication.anonymity). To rotate, set a new ANONYMITY_KEY and
+# ANONYMITY_KEY_ID, then run `manage.py backfill_pseudonyms --sessions`.
+ANONYMITY = {
+    'KEY_ID': os.environ.get('ANONYMITY_KEY_ID', 'v1'),
+    'KEY': os.environ.get('ANONYMITY_KEY', SECRET_KEY),
+}
+
+# Retention: archive_evaluations moves sessions of periods that ended more than
+# ARCHIVE_AFTER_DAYS ago into gzip JSONL files; prune_auth_logs drops old login logs.
+DATA_RETENTION = {
+    'ARCHIVE_DIR': os.environ.get('ARCHIVE_DIR', os.path.join(BASE_DIR, 'archive')),
+    'ARCHIVE_AFTER_DAYS': int(os.environ.get('ARCHIVE_AFTER_DAYS', 180)),
+    'LOGIN_ATTEMPT_DAYS': int(os.environ.get('LOGIN_ATTEMPT_RETENTION_DAYS', 90)),
+    'USER_SESSION_DAYS': int(os.environ.get('USER_SESSION_RETENTION_DAYS', 180)),
+    'BATCH_SIZE': int(os.environ.get('RETENTION_BATCH_SIZE', 1000)),
+}
+
 # Security Settings
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -208,6 +339,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
+        'backend.middleware': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
@@ -246,7 +382,10 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-none-match',
+    'idempotency-key',
 ]
+CORS_EXPOSE_HEADERS = ['ETag', 'Server-Timing', 'Idempotent-Replayed']
 
 # REST Framework Configuration (optional but recommended)
 REST_FRAMEWORK = {
@@ -322,6 +461,11 @@ SPECTACULAR_SETTINGS = {
     ],
     'COMPONENT_SPLIT_REQUEST': True,
     'SORT_OPERATIONS': False,
+    # Async Django views are invisible to the DRF-based generator; document them here
+    'POSTPROCESSING_HOOKS': [
+        'drf_spectacular.hooks.postprocess_schema_enums',
+        'authentication.schema.add_async_view_operations',
+    ],
 }
 
 # Django Supabase Integration Settings
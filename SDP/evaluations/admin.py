@@ -1,6 +1,8 @@
 from django.contrib import admin
 from .models import (
+    DepartmentAnalytics,
     EvaluationCategory,
+    EvaluationPeriod,
     EvaluationQuestion,
     EvaluationSession,
     EvaluationResponse,
@@ -8,6 +10,13 @@ from .models import (
 )
 
 
+@admin.register(EvaluationPeriod)
+class EvaluationPeriodAdmin(admin.ModelAdmin):
+    list_display = ["name", "semester", "year", "start_date", "end_date", "is_active"]
+    list_filter = ["semester", "year", "is_active"]
+    search_fields = ["name", "description"]
+
+
 @admin.register(EvaluationCategory)
 class EvaluationCategoryAdmin(admin.ModelAdmin):
     list_display = ["name", "is_active", "created_at"]
@@ -75,3 +84,17 @@ class StaffResponseAdmin(admin.ModelAdmin):
     short_message.short_description = "Message"
 
 
+
+
+@admin.register(DepartmentAnalytics)
+class DepartmentAnalyticsAdmin(admin.ModelAdmin):
+    list_display = [
+        "department",
+        "period",
+        "total_submissions",
+        "total_responses",
+        "average_rating",
+        "last_calculated",
+    ]
+    list_filter = ["period", "department"]
+    readonly_fields = ["last_calculated", "created_at"]
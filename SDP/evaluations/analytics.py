@@ -0,0 +1,188 @@
+"""Columnar analytics over a department's submitted responses.
+
+Responses are pulled in a single query as integer columns and every statistic is
+computed with NumPy group-bys (bincount/lexsort) rather than per-row Python, so a
+department with 100k+ responses is summarised in a fraction of a second.
+"""
+import time
+
+import numpy as np
+from django.db import connections
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.functions import Coalesce, Length, Trim
+
+from .models import EvaluationQuestion, EvaluationResponse, EvaluationSession
+
+SCALE_MAX = {"likert_5": 5, "likert_10": 10}
+HISTOGRAM_WIDTH = max(SCALE_MAX.values()) + 1
+UNCATEGORIZED = "Uncategorized"
+
+
+def submitted_sessions(department_id: int, period=None):
+    """Submitted sessions for a department, optionally limited to one evaluation period."""
+    sessions = EvaluationSession.objects.filter(department_id=department_id, status="submitted")
+    if period is not None:
+        sessions = sessions.filter(period=period)
+    return sessions
+
+
+def load_response_columns(sessions) -> np.ndarray:
+    """Fetch (question_id, score, boolean, text_length) for the sessions' responses as an int64 array.
+
+    Missing scores and booleans are encoded as -1 in SQL so the rows can go straight
+    from the cursor into NumPy without Django's per-row conversion.
+    """
+    responses = (
+        EvaluationResponse.objects.filter(session__in=sessions)
+        .order_by()
+        .values_list(
+            "question_id",
+            Coalesce("score", Value(-1)),
+            Case(
+                When(boolean_answer=True, then=Value(1)),
+                When(boolean_answer=False, then=Value(0)),
+                default=Value(-1),
+                output_field=IntegerField(),
+            ),
+            Coalesce(Length(Trim("text_answer")), Value(0)),
+        )
+    )
+    sql, params = responses.query.sql_with_params()
+    with connections[responses.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return np.array(rows, dtype=np.int64).reshape(-1, 4)
+
+
+def _group_stats(keys: np.ndarray, values: np.ndarray, n_keys: int):
+    """Count, mean, median and population std of ``values`` grouped by ``keys`` in [0, n_keys)."""
+    counts = np.bincount(keys, minlength=n_keys)
+    sums = np.bincount(keys, weights=values, minlength=n_keys)
+    squares = np.bincount(keys, weights=values * values, minlength=n_keys)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        stds = np.sqrt(np.maximum(squares / counts - means * means, 0))
+
+    # Sort by (key, value) once; each group's median then sits at fixed offsets
+    ordered = values[np.lexsort((values, keys))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    medians = np.full(n_keys, np.nan)
+    present = counts > 0
+    low = starts[present] + (counts[present] - 1) // 2
+    high = starts[present] + counts[present] // 2
+    medians[present] = (ordered[low] + ordered[high]) / 2
+    return counts, means, medians, stds
+
+
+def _num(value, digits: int = 2):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+def build_department_report(department_id: int, period=None) -> dict:
+    """Per-question distributions and per-category comparisons for a department."""
+    started = time.perf_counter()
+    sessions = submitted_sessions(department_id, period)
+    submissions = sessions.count()
+    columns = load_response_columns(sessions)
+
+    answered_ids = np.unique(columns[:, 0])
+    with_responses = set(answered_ids.tolist())
+    questions = [
+        q
+        for q in EvaluationQuestion.objects.filter(department_id=department_id)
+        .order_by("order_index", "id")
+        .values_list("id", "prompt", "scale_type", "is_active", "category__name")
+        # Retired questions are kept only while they still carry responses in scope
+        if q[3] or q[0] in with_responses
+    ]
+
+    # Map question ids to dense row positions so every group-by is a bincount
+    n_questions = len(questions)
+    question_ids = np.array([q[0] for q in questions], dtype=np.int64)
+    lookup = np.full(max(question_ids.max(initial=0), answered_ids.max(initial=0)) + 1, -1, dtype=np.int64)
+    lookup[question_ids] = np.arange(n_questions)
+    positions = lookup[columns[:, 0]]
+    columns, positions = columns[positions >= 0], positions[positions >= 0]
+    scores, booleans, text_lengths = columns[:, 1], columns[:, 2], columns[:, 3]
+
+    scale_max = np.array([SCALE_MAX.get(q[2], 0) for q in questions] or [0], dtype=np.int64)[positions]
+    scored = (scale_max > 0) & (scores >= 1) & (scores <= scale_max)
+    counts, means, medians, stds = _group_stats(positions[scored], scores[scored].astype(float), n_questions)
+    histograms = np.bincount(
+        positions[scored] * HISTOGRAM_WIDTH + scores[scored], minlength=n_questions * HISTOGRAM_WIDTH
+    ).reshape(n_questions, HISTOGRAM_WIDTH)
+    is_boolean = np.array([q[2] == "boolean" for q in questions] or [False])[positions]
+    said_yes, said_no = is_boolean & (booleans == 1), is_boolean & (booleans == 0)
+    yes = np.bincount(positions[said_yes], minlength=n_questions)
+    no = np.bincount(positions[said_no], minlength=n_questions)
+    texts = np.bincount(positions[text_lengths > 0], minlength=n_questions)
+
+    question_stats = []
+    for index, (question_id, prompt, scale_type, is_active, category) in enumerate(questions):
+        entry = {
+            "question_id": question_id,
+            "prompt": prompt,
+            "category": category,
+            "scale_type": scale_type,
+            "is_active": is_active,
+        }
+        if scale_type in SCALE_MAX:
+            answered = int(counts[index])
+            entry.update({
+                "mean": _num(means[index]),
+                "median": _num(medians[index]),
+                "std": _num(stds[index]),
+                "histogram": {
+                    str(score): int(histograms[index, score]) for score in range(1, SCALE_MAX[scale_type] + 1)
+                },
+            })
+        elif scale_type == "boolean":
+            answered = int(yes[index] + no[index])
+            entry.update({
+                "yes": int(yes[index]),
+                "no": int(no[index]),
+                "yes_ratio": _num(yes[index] / answered if answered else None, 4),
+            })
+        else:
+            answered = int(texts[index])
+        entry["responses"] = answered
+        entry["response_rate"] = _num(answered / submissions if submissions else None, 4)
+        question_stats.append(entry)
+
+    # Likert scales are compared across categories on a common 0-100 scale
+    category_names = sorted({q[4] or UNCATEGORIZED for q in questions})
+    category_index = {name: index for index, name in enumerate(category_names)}
+    question_category = np.array([category_index[q[4] or UNCATEGORIZED] for q in questions] or [0], dtype=np.int64)
+    normalized = (scores[scored] - 1) * 100.0 / (scale_max[scored] - 1)
+    cat_counts, cat_means, cat_medians, cat_stds = _group_stats(
+        question_category[positions[scored]], normalized, len(category_names)
+    )
+    cat_yes = np.bincount(question_category[positions[said_yes]], minlength=len(category_names))
+    cat_no = np.bincount(question_category[positions[said_no]], minlength=len(category_names))
+    overall = float(normalized.mean()) if normalized.size else None
+
+    categories = []
+    for index, name in enumerate(category_names):
+        boolean_answers = int(cat_yes[index] + cat_no[index])
+        mean = _num(cat_means[index])
+        categories.append({
+            "category": name,
+            "questions": int((question_category[:n_questions] == index).sum()),
+            "scored_responses": int(cat_counts[index]),
+            "score_pct": mean,
+            "median_pct": _num(cat_medians[index]),
+            "std_pct": _num(cat_stds[index]),
+            "delta_from_department": _num(mean - overall) if mean is not None and overall is not None else None,
+            "yes_ratio": _num(cat_yes[index] / boolean_answers if boolean_answers else None, 4),
+        })
+
+    return {
+        "department_id": department_id,
+        "period": {"id": period.id, "name": period.name} if period is not None else None,
+        "total_submissions": submissions,
+        "total_responses": int(len(columns)),
+        "score_pct": _num(overall),
+        "questions": question_stats,
+        "categories": categories,
+        "computed_in_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
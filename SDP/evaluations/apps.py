@@ -7,3 +7,6 @@ class EvaluationsConfig(AppConfig):
     verbose_name = "Evaluations"
 
 
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,141 @@
+"""Versioned cache for the public question list.
+
+Serialized question lists are stored in the shared Django cache under keys that embed
+a per-department version token, with a small in-process LRU in front of it. Changing a
+question replaces the department's token, so every worker misses on its next read
+without having to find and delete the old entries.
+"""
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEPARTMENT_VERSION_KEY = "eval:questions:version:{department_id}"
+CATEGORY_VERSION_KEY = "eval:questions:version:categories"
+ENTRY_KEY = "eval:questions:{department_id}:{category_id}:{department_version}:{category_version}"
+
+
+class LocalLRU:
+    """Thread-safe, size-bounded mapping used as the first cache tier."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_cache = LocalLRU(getattr(settings, "QUESTION_CACHE_LRU_SIZE", 256))
+
+
+def _shared():
+    return caches[getattr(settings, "QUESTION_CACHE_ALIAS", "default")]
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def _versions(department_id) -> tuple[str, str]:
+    shared = _shared()
+    keys = [DEPARTMENT_VERSION_KEY.format(department_id=department_id), CATEGORY_VERSION_KEY]
+    found = shared.get_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            # A fresh token can never collide with entries cached under an evicted one
+            shared.add(key, _new_version(), timeout=None)
+            found[key] = shared.get(key)
+        versions.append(found[key])
+    return versions[0], versions[1]
+
+
+def compute_etag(payload) -> str:
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+
+
+def get_question_list(department_id, category_id, build):
+    """Return ``(payload, etag)`` for a question list, calling ``build()`` on a miss."""
+    department_version, category_version = _versions(department_id)
+    key = ENTRY_KEY.format(
+        department_id=department_id,
+        category_id=category_id or "all",
+        department_version=department_version,
+        category_version=category_version,
+    )
+
+    entry = local_cache.get(key)
+    if entry is None:
+        shared = _shared()
+        entry = shared.get(key)
+        if entry is None:
+            payload = build()
+            entry = {"payload": payload, "etag": compute_etag(payload)}
+            shared.set(key, entry, getattr(settings, "QUESTION_CACHE_TIMEOUT", 300))
+        local_cache.set(key, entry)
+    return entry["payload"], entry["etag"]
+
+
+async def _aversions(department_id) -> tuple[str, str]:
+    shared = _shared()
+    keys = [DEPARTMENT_VERSION_KEY.format(department_id=department_id), CATEGORY_VERSION_KEY]
+    found = await shared.aget_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            await shared.aadd(key, _new_version(), timeout=None)
+            found[key] = await shared.aget(key)
+        versions.append(found[key])
+    return versions[0], versions[1]
+
+
+async def aget_question_list(department_id, category_id, build):
+    """Async version of get_question_list(); ``build`` is a coroutine function."""
+    department_version, category_version = await _aversions(department_id)
+    key = ENTRY_KEY.format(
+        department_id=department_id,
+        category_id=category_id or "all",
+        department_version=department_version,
+        category_version=category_version,
+    )
+
+    entry = local_cache.get(key)
+    if entry is None:
+        shared = _shared()
+        entry = await shared.aget(key)
+        if entry is None:
+            payload = await build()
+            entry = {"payload": payload, "etag": compute_etag(payload)}
+            await shared.aset(key, entry, getattr(settings, "QUESTION_CACHE_TIMEOUT", 300))
+        local_cache.set(key, entry)
+    return entry["payload"], entry["etag"]
+
+
+def invalidate_department(department_id):
+    _shared().set(DEPARTMENT_VERSION_KEY.format(department_id=department_id), _new_version(), timeout=None)
+
+
+def invalidate_categories():
+    _shared().set(CATEGORY_VERSION_KEY, _new_version(), timeout=None)
@@ -0,0 +1,92 @@
+"""Idempotency-Key support for retry-prone POST endpoints.
+
+A client that sends ``Idempotency-Key: <unique string>`` gets the first response for
+that key replayed on every retry, without the view running again. Entries live in the
+Django cache (``IDEMPOTENCY_CACHE_ALIAS``) for ``IDEMPOTENCY_KEY_TTL`` seconds and hold
+only the status code, a hash of the request body and the compact JSON payload. Keys are
+scoped to the user and the view, and reusing one with a different body is rejected.
+Requests without the header behave exactly as before.
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.response import Response
+
+HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+ENTRY_KEY = "eval:idempotency:{user_id}:{view}:{key_hash}"
+MAX_KEY_LENGTH = 255
+# Placeholder while the first request runs; bounds how long a crashed worker blocks the key
+IN_PROGRESS = "in_progress"
+IN_PROGRESS_TIMEOUT = 60
+
+
+def _store():
+    return caches[getattr(settings, "IDEMPOTENCY_CACHE_ALIAS", "default")]
+
+
+def _fingerprint(data) -> str:
+    body = json.dumps(data, sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder)
+    return hashlib.sha256(body.encode()).hexdigest()[:32]
+
+
+def _error(message, status, **headers):
+    response = Response({"success": False, "message": message}, status=status)
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+def idempotent(view_func):
+    """Replay the stored response for a repeated ``Idempotency-Key``. Apply inside ``@api_view``."""
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        key = request.headers.get(HEADER, "").strip()
+        if not key:
+            return view_func(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(f"{HEADER} must be at most {MAX_KEY_LENGTH} characters.", 400)
+
+        store = _store()
+        cache_key = ENTRY_KEY.format(
+            user_id=request.user.pk,
+            view=view_func.__name__,
+            key_hash=hashlib.sha256(key.encode()).hexdigest()[:32],
+        )
+        fingerprint = _fingerprint(request.data)
+
+        # add() is atomic, so only one of several concurrent retries runs the view
+        if not store.add(cache_key, IN_PROGRESS, IN_PROGRESS_TIMEOUT):
+            entry = store.get(cache_key)
+            # None: the placeholder expired between add() and get(); a retry will run the view
+            if entry is None or entry == IN_PROGRESS:
+                return _error("Request with this Idempotency-Key is being processed.", 409, **{"Retry-After": "1"})
+            status_code, stored_fingerprint, body = entry
+            if stored_fingerprint != fingerprint:
+                return _error(f"{HEADER} was already used with a different request.", 422)
+            response = Response(json.loads(body), status=status_code)
+            response[REPLAY_HEADER] = "true"
+            return response
+
+        try:
+            response = view_func(request, *args, **kwargs)
+        except BaseException:
+            store.delete(cache_key)
+            raise
+
+        if response.status_code < 500 and isinstance(response, Response):
+            body = json.dumps(response.data, separators=(",", ":"), cls=DjangoJSONEncoder)
+            store.set(
+                cache_key,
+                (response.status_code, fingerprint, body),
+                getattr(settings, "IDEMPOTENCY_KEY_TTL", 86400),
+            )
+        else:
+            # Server errors are not final; a retry with the same key runs the view again
+            store.delete(cache_key)
+        return response
+    return _wrapped_view
@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.models import Department
+from evaluations.analytics import build_department_report
+from evaluations.models import EvaluationPeriod
+
+
+class Command(BaseCommand):
+    help = "Print per-question distributions and category comparisons for one or all departments as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--department", type=int, help="Department id (defaults to every active department)")
+        parser.add_argument("--period", type=int, help="Evaluation period id (defaults to all submissions)")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+
+    def handle(self, *args, **options):
+        period = None
+        if options["period"]:
+            period = EvaluationPeriod.objects.filter(id=options["period"]).first()
+            if period is None:
+                raise CommandError(f"Evaluation period {options['period']} does not exist")
+
+        if options["department"]:
+            department_ids = [options["department"]]
+        else:
+            department_ids = list(Department.objects.filter(is_active=True).values_list("id", flat=True))
+
+        reports = []
+        for department_id in department_ids:
+            report = build_department_report(department_id, period)
+            self.stderr.write(
+                f"department {department_id}: {report['total_responses']} responses "
+                f"in {report['computed_in_ms']} ms"
+            )
+            reports.append(report)
+
+        payload = json.dumps(reports[0] if options["department"] else reports, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                fh.write(payload)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(reports)} report(s) to {options['output']}"))
+        else:
+            self.stdout.write(payload)
@@ -0,0 +1,170 @@
+import gzip
+import json
+import os
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from evaluations.models import DepartmentAnalytics, EvaluationPeriod, EvaluationResponse, EvaluationSession, StaffResponse
+
+SESSION_FIELDS = [
+    "id",
+    "student_id",
+    "department_id",
+    "evaluation_key_id",
+    "status",
+    "anonymous_identity",
+    "started_at",
+    "submitted_at",
+]
+RESPONSE_FIELDS = ["session_id", "question_id", "score", "boolean_answer", "text_answer", "created_at"]
+STAFF_RESPONSE_FIELDS = ["session_id", "responder_id", "message", "created_at"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive submitted sessions and their responses of closed evaluation periods to gzip JSONL "
+        "files, then delete exactly the archived rows from the live tables in bounded batches"
+    )
+
+    def add_arguments(self, parser):
+        retention = settings.DATA_RETENTION
+        parser.add_argument("--period", type=int, help="Only archive this period id (it must still be closed)")
+        parser.add_argument(
+            "--after-days",
+            type=int,
+            default=retention["ARCHIVE_AFTER_DAYS"],
+            help="Archive periods that ended at least this many days ago",
+        )
+        parser.add_argument("--output-dir", default=retention["ARCHIVE_DIR"], help="Directory for archive files")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=retention["BATCH_SIZE"],
+            help="Sessions read, and deleted per transaction, at a time",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+        parser.add_argument("--keep", action="store_true", help="Write the archive but leave the live rows in place")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.localdate() - timedelta(days=options["after_days"])
+        periods = EvaluationPeriod.objects.filter(is_active=False, end_date__lt=cutoff).order_by("start_date")
+        if options["period"]:
+            periods = periods.filter(id=options["period"])
+            if not periods.exists():
+                raise CommandError(f"Period {options['period']} is unknown, active or ended after {cutoff}")
+
+        # Archived periods are only reported through their analytics rows, so those must exist first
+        for period in periods:
+            missing = sorted(
+                EvaluationSession.objects.filter(period=period, status="submitted")
+                .exclude(department_id__in=DepartmentAnalytics.objects.filter(period=period).values("department_id"))
+                .order_by()
+                .values_list("department_id", flat=True)
+                .distinct()
+            )
+            if missing:
+                raise CommandError(
+                    f"{period.name}: no analytics row for department(s) {', '.join(map(str, missing))}; "
+                    f"run rebuild_department_analytics --period {period.id} first"
+                )
+
+        os.makedirs(options["output_dir"], exist_ok=True)
+        for period in periods:
+            # Only submitted sessions are final; drafts left in a closed period are not archived
+            sessions = EvaluationSession.objects.filter(period=period, status="submitted")
+            count = sessions.count()
+            if not count:
+                continue
+            if options["dry_run"]:
+                responses = EvaluationResponse.objects.filter(session__in=sessions).count()
+                self.stdout.write(f"{period.name}: would archive {count} sessions and {responses} responses")
+                continue
+
+            stamp = timezone.now().strftime("%Y%m%dT%H%M%S%f")
+            path = os.path.join(options["output_dir"], f"evaluations_period_{period.id}_{stamp}.jsonl.gz")
+            archived = self.write_archive(period, sessions, path, options["batch_size"])
+            self.stdout.write(f"{period.name}: wrote {len(archived)} sessions to {path}")
+            if options["keep"]:
+                continue
+
+            deleted = self.delete_archived(archived, options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"{period.name}: deleted {deleted} archived sessions"))
+            if deleted < len(archived):
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{period.name}: skipped {len(archived) - deleted} sessions that changed after they were "
+                        "written; those still live are archived again on the next run"
+                    )
+                )
+
+    def write_archive(self, period, sessions, path, batch_size):
+        """Stream sessions with their responses into ``path``; the file only appears once complete.
+
+        Returns ``{session id: snapshot}`` for every session written, see ``snapshot``.
+        """
+        partial = f"{path}.partial"
+        archived, last_id = {}, 0
+        with gzip.open(partial, "wt", encoding="utf-8") as fh:
+            while True:
+                batch = list(sessions.filter(id__gt=last_id).order_by("id").values(*SESSION_FIELDS)[:batch_size])
+                if not batch:
+                    break
+                ids = [row["id"] for row in batch]
+                responses = {
+                    session_id: [dict(zip(RESPONSE_FIELDS[1:], row[1:])) for row in rows]
+                    for session_id, rows in groupby(
+                        EvaluationResponse.objects.filter(session_id__in=ids)
+                        .order_by("session_id", "question_id")
+                        .values_list(*RESPONSE_FIELDS),
+                        key=itemgetter(0),
+                    )
+                }
+                replies = {
+                    row["session_id"]: row
+                    for row in StaffResponse.objects.filter(session_id__in=ids).values(*STAFF_RESPONSE_FIELDS)
+                }
+                for row in batch:
+                    row["period"] = {"id": period.id, "name": period.name}
+                    row["responses"] = responses.get(row["id"], [])
+                    row["staff_response"] = replies.get(row["id"])
+                    archived[row["id"]] = self.snapshot(row["status"], row["submitted_at"], row["staff_response"])
+                    fh.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+                last_id = ids[-1]
+        os.replace(partial, path)
+        return archived
+
+    @staticmethod
+    def snapshot(status, submitted_at, staff_response):
+        """What may still change about a session once it is submitted: a staff reply can be added."""
+        return status, submitted_at, staff_response["created_at"] if staff_response else None
+
+    def delete_archived(self, archived, batch_size):
+        """Delete the archived sessions that still match their snapshot; returns how many were deleted."""
+        ids = sorted(archived)
+        deleted = 0
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            with transaction.atomic():
+                # Row locks keep staff replies from being added between the check and the delete
+                current = (
+                    EvaluationSession.objects.select_for_update(of=("self",))
+                    .filter(id__in=batch)
+                    .values_list("id", "status", "submitted_at", "staff_response__created_at")
+                )
+                unchanged = [
+                    session_id
+                    for session_id, status, submitted_at, replied_at in current
+                    if archived[session_id] == (status, submitted_at, replied_at)
+                ]
+                EvaluationResponse.objects.filter(session_id__in=unchanged).delete()
+                StaffResponse.objects.filter(session_id__in=unchanged).delete()
+                EvaluationSession.objects.filter(id__in=unchanged).delete()
+            deleted += len(unchanged)
+        return deleted
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from authentication.anonymity import compute_pseudonym, current_key
+from authentication.models import AUNUser
+from evaluations.models import EvaluationSession
+
+
+class Command(BaseCommand):
+    help = "Compute stored evaluation pseudonyms for students in chunks, e.g. after rotating ANONYMITY_KEY"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Students processed per transaction")
+        parser.add_argument(
+            "--sessions",
+            action="store_true",
+            help="Also rewrite anonymous_identity on existing sessions that differ from the students' current pseudonyms",
+        )
+
+    def handle(self, *args, **options):
+        key_id, _ = current_key()
+        batch_size = options["batch_size"]
+
+        stale = AUNUser.objects.filter(role="student").exclude(anonymous_key_id=key_id, anonymous_id__gt="")
+        updated, last_id = 0, 0
+        while True:
+            batch = list(stale.filter(id__gt=last_id).order_by("id").only("id", "aun_id")[:batch_size])
+            if not batch:
+                break
+            for user in batch:
+                user.anonymous_id = compute_pseudonym(user)
+                user.anonymous_key_id = key_id
+            AUNUser.objects.bulk_update(batch, ["anonymous_id", "anonymous_key_id"])
+            updated += len(batch)
+            last_id = batch[-1].id
+        self.stdout.write(self.style.SUCCESS(f"Computed {updated} pseudonyms under key {key_id}."))
+
+        if not options["sessions"]:
+            return
+
+        # Students who opted out of anonymous evaluations keep an empty identity, as at start
+        pseudonym = Coalesce(
+            Subquery(
+                AUNUser.objects.filter(pk=OuterRef("student_id"), anonymous_evaluations=True).values("anonymous_id")[:1]
+            ),
+            Value(""),
+        )
+        students = AUNUser.objects.filter(role="student").order_by("id").values_list("id", flat=True)
+        rewritten, last_id = 0, 0
+        while True:
+            ids = list(students.filter(id__gt=last_id)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                # Sessions already carrying the current identity are left untouched (no dead tuples)
+                rewritten += (
+                    EvaluationSession.objects.filter(student_id__in=ids)
+                    .exclude(anonymous_identity=pseudonym)
+                    .update(anonymous_identity=pseudonym)
+                )
+            last_id = ids[-1]
+        self.stdout.write(self.style.SUCCESS(f"Rewrote anonymous_identity on {rewritten} sessions."))
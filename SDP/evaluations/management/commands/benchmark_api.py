@@ -0,0 +1,288 @@
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from authentication.models import AUNUser, EvaluationKey
+from evaluations.management.commands.seed_evaluations import (
+    BENCH_DEPARTMENT_PREFIX,
+    BENCH_PASSWORD,
+    BENCH_STUDENT_PREFIX,
+)
+from evaluations.models import EvaluationQuestion
+
+# Endpoints whose regressions fail --compare by default
+GUARDED_ENDPOINTS = ["submit_evaluation", "export_department_csv"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay login -> validate-key -> start -> submit -> analytics/export traffic through the "
+        "Django test client and write latency percentiles, query counts and peak RSS to JSON. "
+        "Writes to the configured database: point it at a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50, help="Student journeys to replay")
+        parser.add_argument("--output", default="bench_report.json", help="Where to write the JSON report")
+        parser.add_argument("--seed", action="store_true", help="Seed volume data before running")
+        parser.add_argument("--departments", type=int, default=4)
+        parser.add_argument("--questions", type=int, default=40)
+        parser.add_argument("--students", type=int, default=500)
+        parser.add_argument("--sessions", type=int, default=5000)
+        parser.add_argument(
+            "--burst",
+            type=int,
+            default=0,
+            help="Also fire this many concurrent starts at one key limited to half as many uses",
+        )
+        parser.add_argument("--compare", help="Baseline report to compare against")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed relative p95 latency regression before --compare fails (0.25 = 25%%)",
+        )
+        parser.add_argument(
+            "--fail-on",
+            nargs="*",
+            default=GUARDED_ENDPOINTS,
+            help="Endpoints checked by --compare",
+        )
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            call_command(
+                "seed_evaluations",
+                departments=options["departments"],
+                questions=options["questions"],
+                students=options["students"],
+                sessions=options["sessions"],
+                stdout=self.stdout,
+            )
+
+        students = list(AUNUser.objects.filter(aun_id__startswith=BENCH_STUDENT_PREFIX)[: options["iterations"]])
+        admin = AUNUser.objects.filter(role="admin").first()
+        if not students or admin is None:
+            raise CommandError("Needs seeded benchmark students and an admin user (try --seed).")
+
+        self.samples = {}
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            self.replay(students, admin)
+            burst = self.key_burst(options["burst"], admin) if options["burst"] else None
+
+        report = {
+            "commit": self.git_commit(),
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "iterations": len(students),
+            "peak_rss_kb": self.peak_rss_kb(),
+            "endpoints": {name: self.summarize(samples) for name, samples in self.samples.items()},
+            "key_burst": burst,
+        }
+        with open(options["output"], "w") as fh:
+            json.dump(report, fh, indent=2)
+        self.print_report(report)
+        self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+        if options["compare"]:
+            with open(options["compare"]) as fh:
+                baseline = json.load(fh)
+            failures = self.compare(baseline, report, options["fail_on"], options["threshold"])
+            for failure in failures:
+                self.stderr.write(self.style.ERROR(failure))
+            if failures:
+                raise CommandError(f"{len(failures)} benchmark regression(s) against {options['compare']}")
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+
+    # Traffic -----------------------------------------------------------------
+
+    def call(self, name, client, method, path, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = getattr(client, method)(path, **kwargs)
+            if getattr(response, "streaming", False):
+                for _ in response.streaming_content:
+                    pass
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        self.samples.setdefault(name, []).append(
+            {
+                "ms": elapsed_ms,
+                "queries": len(queries.captured_queries),
+                "duplicates": self.duplicate_count(queries.captured_queries),
+                "status": response.status_code,
+                "rss_kb": self.peak_rss_kb(),
+            }
+        )
+        return response
+
+    def replay(self, students, admin):
+        departments = {}
+        for student in students:
+            client = Client()
+            self.call(
+                "login", client, "post", "/auth/login/",
+                data={"aun_id": student.aun_id, "password": BENCH_PASSWORD}, content_type="application/json",
+            )
+
+            dept_id, key = self.pick_department(departments, student.id)
+            self.call(
+                "validate_evaluation_key", client, "post", "/auth/validate-key/",
+                data={"key": key, "department_id": dept_id}, content_type="application/json",
+            )
+            self.call("list_questions", client, "get", f"/eval/questions/?department_id={dept_id}")
+            started = self.call(
+                "start_evaluation", client, "post", "/eval/start/",
+                data={"department_id": dept_id, "key": key}, content_type="application/json",
+            )
+            if started.status_code != 201:
+                continue
+            session_id = started.json()["data"]["session_id"]
+            answers = [
+                {"question_id": qid, "score": 1 + (qid + student.id) % 5}
+                for qid in EvaluationQuestion.objects.filter(
+                    department_id=dept_id, is_active=True, scale_type="likert_5"
+                ).values_list("id", flat=True)
+            ]
+            self.call(
+                "submit_evaluation", client, "post", "/eval/submit/",
+                data={"session_id": session_id, "responses": answers}, content_type="application/json",
+            )
+
+        staff = Client()
+        staff.force_login(admin)
+        for dept_id, _ in departments.values():
+            self.call("department_analytics", staff, "get", f"/eval/department/{dept_id}/analytics/")
+            self.call("list_department_sessions", staff, "get", f"/eval/department/{dept_id}/sessions/")
+            self.call("export_department_csv", staff, "get", f"/eval/department/{dept_id}/export.csv")
+
+    def pick_department(self, cache, seed):
+        if not cache:
+            for key in EvaluationKey.objects.filter(department__code__startswith=BENCH_DEPARTMENT_PREFIX):
+                cache[key.department_id] = (key.department_id, key.key)
+            if not cache:
+                raise CommandError("No benchmark evaluation keys found (try --seed).")
+        ordered = sorted(cache.values())
+        return ordered[seed % len(ordered)]
+
+    def key_burst(self, attempts, admin):
+        """Fire concurrent starts at one key and check usage_limit held."""
+        dept_id, _ = self.pick_department({}, 0)
+        key = EvaluationKey.objects.create(
+            key=f"BURST{int(time.time()) % 10 ** 8}",
+            department_id=dept_id,
+            created_by=admin,
+            usage_limit=max(attempts // 2, 1),
+            valid_until=timezone.now() + timedelta(hours=1),
+            description="benchmark_api key burst",
+        )
+        barrier = threading.Barrier(attempts)
+        results = []
+
+        def worker():
+            barrier.wait()
+            try:
+                results.append(EvaluationKey.objects.consume(key.key, dept_id) is not None)
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        key.refresh_from_db()
+        return {
+            "attempts": attempts,
+            "usage_limit": key.usage_limit,
+            "granted": sum(results),
+            "usage_count": key.total_usage,
+            "limit_held": key.total_usage <= key.usage_limit and sum(results) == key.total_usage,
+            "per_second": round(attempts / elapsed, 1) if elapsed else None,
+        }
+
+    # Reporting ---------------------------------------------------------------
+
+    @staticmethod
+    def duplicate_count(captured):
+        seen, duplicates = set(), 0
+        for query in captured:
+            if query["sql"] in seen:
+                duplicates += 1
+            seen.add(query["sql"])
+        return duplicates
+
+    @staticmethod
+    def percentile(values, pct):
+        ordered = sorted(values)
+        index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+
+    def summarize(self, samples):
+        latencies = [s["ms"] for s in samples]
+        return {
+            "count": len(samples),
+            "errors": sum(1 for s in samples if s["status"] >= 400),
+            "p50_ms": round(self.percentile(latencies, 50), 2),
+            "p95_ms": round(self.percentile(latencies, 95), 2),
+            "p99_ms": round(self.percentile(latencies, 99), 2),
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            "mean_queries": round(statistics.fmean(s["queries"] for s in samples), 2),
+            "max_queries": max(s["queries"] for s in samples),
+            "max_duplicate_queries": max(s["duplicates"] for s in samples),
+            "max_rss_kb": max(s["rss_kb"] for s in samples),
+        }
+
+    @staticmethod
+    def peak_rss_kb():
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    @staticmethod
+    def compare(baseline, report, endpoints, threshold):
+        failures = []
+        for name in endpoints:
+            old, new = baseline["endpoints"].get(name), report["endpoints"].get(name)
+            if not old or not new:
+                continue
+            if new["p95_ms"] > old["p95_ms"] * (1 + threshold):
+                failures.append(f"{name}: p95 {old['p95_ms']}ms -> {new['p95_ms']}ms (> {threshold:.0%})")
+            if new["max_queries"] > old["max_queries"]:
+                failures.append(f"{name}: queries {old['max_queries']} -> {new['max_queries']}")
+        return failures
+
+    def print_report(self, report):
+        self.stdout.write(f"{'endpoint':<28}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'queries':>9}")
+        for name, stats in report["endpoints"].items():
+            self.stdout.write(
+                f"{name:<28}{stats['count']:>6}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+                f"{stats['p99_ms']:>10}{stats['max_queries']:>9}"
+            )
+        self.stdout.write(f"peak RSS: {report['peak_rss_kb']} KB")
+        if report["key_burst"]:
+            self.stdout.write(f"key burst: {report['key_burst']}")
@@ -0,0 +1,142 @@
+import copy
+import json
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+from authentication.models import Department
+from evaluations.models import EvaluationQuestion
+
+MODES = ["no_reuse", "persistent", "pool"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request database latency without connection reuse, with persistent "
+        "connections (CONN_MAX_AGE + health checks) and with the psycopg 3 pool. Requests are "
+        "simulated with Django's request_started/request_finished signals, so connections are "
+        "opened, checked and closed exactly as they are for real traffic. PostgreSQL only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=300, help="Simulated requests per mode")
+        parser.add_argument("--threads", type=int, default=1, help="Concurrent workers sharing the requests")
+        parser.add_argument("--modes", nargs="*", choices=MODES, default=MODES)
+        parser.add_argument("--pool-size", type=int, default=4, help="Pool max_size for the pool mode")
+        parser.add_argument("--output", help="Also write the results to this JSON file")
+
+    def handle(self, *args, **options):
+        base = connections.settings[DEFAULT_DB_ALIAS]
+        if base["ENGINE"] != "django.db.backends.postgresql":
+            raise CommandError("benchmark_db_connections needs a PostgreSQL database.")
+
+        results = {}
+        for mode in options["modes"]:
+            alias = self.configure(mode, base, options["pool_size"])
+            try:
+                results[mode] = self.run(alias, options["requests"], options["threads"])
+            finally:
+                connections[alias].close()
+                if mode == "pool":
+                    connections[alias].close_pool()
+            self.print_row(mode, results[mode])
+
+        if "no_reuse" in results:
+            baseline = results["no_reuse"]["mean_ms"]
+            for mode, result in results.items():
+                if mode != "no_reuse" and result["mean_ms"]:
+                    self.stdout.write(f"{mode}: {baseline / result['mean_ms']:.1f}x faster per request than no_reuse")
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def configure(self, mode, base, pool_size):
+        """Register a connection alias with the default database's settings and ``mode``'s reuse policy."""
+        config = copy.deepcopy(base)
+        config["OPTIONS"].pop("pool", None)
+        config["CONN_MAX_AGE"] = 0
+        config["CONN_HEALTH_CHECKS"] = mode != "no_reuse"
+        if mode == "persistent":
+            config["CONN_MAX_AGE"] = 600
+        elif mode == "pool":
+            config["OPTIONS"]["pool"] = {"min_size": 1, "max_size": pool_size}
+        alias = f"bench_{mode}"
+        connections.settings[alias] = config
+        return alias
+
+    def run(self, alias, requests, threads):
+        latencies, lock = [], threading.Lock()
+        connects = []
+
+        def count_connect(sender, connection, **kwargs):
+            if connection.alias == alias:
+                with lock:
+                    connects.append(1)
+
+        def worker(count):
+            samples = []
+            try:
+                for _ in range(count):
+                    started = time.perf_counter()
+                    self.request(alias)
+                    samples.append((time.perf_counter() - started) * 1000)
+            finally:
+                connections[alias].close()
+            with lock:
+                latencies.extend(samples)
+
+        connection_created.connect(count_connect)
+        try:
+            shares = [requests // threads + (1 if i < requests % threads else 0) for i in range(threads)]
+            started = time.perf_counter()
+            workers = [threading.Thread(target=worker, args=(share,)) for share in shares if share]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(count_connect)
+
+        latencies.sort()
+        return {
+            "requests": len(latencies),
+            "threads": threads,
+            "mean_ms": round(statistics.fmean(latencies), 2) if latencies else None,
+            "p50_ms": round(latencies[len(latencies) // 2], 2) if latencies else None,
+            "p95_ms": round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)], 2) if latencies else None,
+            # With the pool every checkout fires connection_created; only pool stats show real connects
+            "connections_opened": (
+                connections[alias].pool.get_stats().get("connections_num", 0)
+                if connections.settings[alias]["OPTIONS"].get("pool")
+                else len(connects)
+            ),
+            "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        }
+
+    @staticmethod
+    def request(alias):
+        """One request's worth of reads, wrapped in the signals that open and release connections."""
+        request_started.send(sender=Command)
+        try:
+            Department.objects.using(alias).filter(is_active=True).count()
+            list(
+                EvaluationQuestion.objects.using(alias)
+                .filter(is_active=True)
+                .order_by("order_index", "id")
+                .values_list("id", "prompt")[:40]
+            )
+        finally:
+            request_finished.send(sender=Command)
+
+    def print_row(self, mode, result):
+        self.stdout.write(
+            f"{mode:<11} mean {result['mean_ms']}ms  p50 {result['p50_ms']}ms  p95 {result['p95_ms']}ms  "
+            f"{result['connections_opened']} connections  {result['requests_per_second']} req/s"
+        )
@@ -0,0 +1,115 @@
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+
+from authentication.models import AUNUser
+from backend import routers
+from backend.middleware import ReadYourWritesMiddleware
+from evaluations.models import EvaluationSession
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the replica-routed read endpoints query the 'replica' database, that a "
+        "pinned client reads from the primary, and that a write pins the client. Works with "
+        "any pair of databases, e.g. two SQLite files or two PostgreSQL databases."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--department", type=int, help="Department to read (default: one with submitted sessions)")
+
+    def handle(self, *args, **options):
+        if not routers.replica_configured():
+            raise CommandError("No 'replica' database is configured (set DB_REPLICA_NAME or DB_REPLICA_HOST).")
+        admin = AUNUser.objects.filter(role="admin", is_active=True).first()
+        if admin is None:
+            raise CommandError("Needs an active admin user.")
+        # Pick rows the replica already has; it may lag behind the primary
+        sessions = EvaluationSession.objects.using(routers.REPLICA_DB_ALIAS).filter(status="submitted")
+        if options["department"]:
+            sessions = sessions.filter(department_id=options["department"])
+        session = sessions.order_by("-id").first()
+        if session is None:
+            raise CommandError("Needs at least one submitted evaluation session.")
+
+        department_id = session.department_id
+        paths = {
+            "department_analytics": f"/eval/department/{department_id}/analytics/",
+            "list_department_sessions": f"/eval/department/{department_id}/sessions/?period=all",
+            "session_detail": f"/eval/session/{session.id}/",
+            "export_department_csv": f"/eval/department/{department_id}/export.csv?period=all",
+        }
+
+        failures = []
+        for name, path in paths.items():
+            status, aliases = self.fetch(admin, path)
+            ok = status == 200 and aliases[routers.REPLICA_DB_ALIAS] and not aliases[DEFAULT_DB_ALIAS]
+            failures += self.report(f"{name} reads from replica", ok, status, aliases)
+
+        status, aliases = self.fetch(admin, paths["list_department_sessions"], pinned=True)
+        ok = status == 200 and aliases[DEFAULT_DB_ALIAS] and not aliases[routers.REPLICA_DB_ALIAS]
+        failures += self.report("pinned client reads from primary", ok, status, aliases)
+
+        # A request that writes (here: rewriting admin's last_login unchanged) must set the pin cookie
+        def write_view(request):
+            AUNUser.objects.filter(pk=admin.pk).update(last_login=admin.last_login)
+            return HttpResponse()
+
+        response = ReadYourWritesMiddleware(write_view)(RequestFactory().post("/"))
+        pinned = routers.PIN_COOKIE_NAME in response.cookies
+        failures += self.report("write pins the client to the primary", pinned, response.status_code, Counter())
+
+        if failures:
+            raise CommandError(f"{len(failures)} routing check(s) failed: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Replica routing behaves as expected."))
+
+    def fetch(self, user, path, pinned=False):
+        """Call the view behind ``path`` as ``user`` and count the queries each database alias ran.
+
+        The view is called directly with ``request.user`` set, so the check needs no session
+        row on the replica and works with two independent copies of the database.
+        """
+        request = RequestFactory().get(path)
+        request.user = user
+
+        async def auser():
+            return user
+
+        request.auser = auser
+        if pinned:
+            request.COOKIES[routers.PIN_COOKIE_NAME] = str(time.time() + 60)
+        match = resolve(request.path_info)
+        view = match.func
+        if iscoroutinefunction(view):
+            view = async_to_sync(view)
+
+        aliases = Counter()
+
+        def recorder(alias):
+            def record(execute, sql, params, many, context):
+                aliases[alias] += 1
+                return execute(sql, params, many, context)
+            return record
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder(alias)))
+            response = view(request, *match.args, **match.kwargs)
+            if getattr(response, "streaming", False):
+                b"".join(response.streaming_content)
+            elif hasattr(response, "render"):
+                response.render()
+        return response.status_code, aliases
+
+    def report(self, label, ok, status, aliases):
+        counts = ", ".join(f"{alias}={count}" for alias, count in sorted(aliases.items())) or "no queries"
+        line = f"{'ok  ' if ok else 'FAIL'}  {label} (HTTP {status}; {counts})"
+        self.stdout.write(self.style.SUCCESS(line) if ok else self.style.ERROR(line))
+        return [] if ok else [label]
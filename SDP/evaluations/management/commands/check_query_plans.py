@@ -0,0 +1,120 @@
+import json
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from authentication.models import Department, EvaluationKey, LoginAttempt
+from authentication.stats import start_of_today
+from evaluations.models import EvaluationPeriod, EvaluationQuestion, EvaluationResponse, EvaluationSession
+
+# Index each hot query must be planned with; None accepts any index (e.g. an implicit unique one)
+EXPECTED_INDEXES = {
+    "active questions for a department": "eval_question_dept_active_idx",
+    "submitted sessions page": "eval_session_submitted_idx",
+    "submitted sessions page for a period": "eval_session_period_idx",
+    "scored responses for a session": "eval_response_scored_idx",
+    "evaluation key lookup": None,
+    "keys by department": "evalkey_dept_created_idx",
+    "failed logins today": "loginattempt_failed_ts_idx",
+    "recent successful logins": "loginattempt_success_ts_idx",
+}
+PLANNED_TABLES = [
+    EvaluationQuestion,
+    EvaluationSession,
+    EvaluationResponse,
+    EvaluationKey,
+    LoginAttempt,
+]
+SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)|USING (?:INTEGER )?(PRIMARY KEY)")
+
+
+def hot_queries(department_id, period_id, session_id):
+    """The filtered lookups every request path depends on, keyed by a readable label."""
+    return {
+        "active questions for a department": EvaluationQuestion.objects.filter(
+            department_id=department_id, is_active=True
+        ).order_by("order_index"),
+        "submitted sessions page": EvaluationSession.objects.filter(
+            department_id=department_id, status="submitted"
+        ).order_by("-submitted_at", "-id")[:51],
+        "submitted sessions page for a period": EvaluationSession.objects.filter(
+            period_id=period_id, department_id=department_id, status="submitted"
+        ).order_by("-submitted_at", "-id")[:51],
+        "scored responses for a session": EvaluationResponse.objects.filter(
+            session_id=session_id, score__isnull=False
+        ).values_list("question_id", "score"),
+        "evaluation key lookup": EvaluationKey.objects.filter(key="BENCHKEY", department_id=department_id),
+        "keys by department": EvaluationKey.objects.filter(department_id=department_id).order_by("-created_at")[:50],
+        "failed logins today": LoginAttempt.objects.filter(success=False, timestamp__gte=start_of_today()),
+        "recent successful logins": LoginAttempt.objects.filter(success=True)[:10],
+    }
+
+
+def planned_indexes(queryset):
+    """Return the names of the indexes the database plans to use for ``queryset``."""
+    if connection.vendor == "postgresql":
+        names = set()
+        pending = [json.loads(queryset.explain(format="json"))[0]["Plan"]]
+        while pending:
+            node = pending.pop()
+            if "Index Name" in node:
+                names.add(node["Index Name"])
+            pending.extend(node.get("Plans", []))
+        return names
+    if connection.vendor == "sqlite":
+        return {index or primary for index, primary in SQLITE_INDEX.findall(queryset.explain())}
+    raise CommandError(f"Plan checks are not supported on {connection.vendor}")
+
+
+def analyze_tables():
+    """Refresh planner statistics so plans reflect the real row counts."""
+    with connection.cursor() as cursor:
+        for model in PLANNED_TABLES:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+
+def check_plans(department_id, period_id, session_id):
+    """Yield (label, expected index, planned indexes, ok) for every hot query."""
+    for label, queryset in hot_queries(department_id, period_id, session_id).items():
+        expected = EXPECTED_INDEXES[label]
+        indexes = planned_indexes(queryset)
+        yield label, expected, indexes, (expected in indexes) if expected else bool(indexes)
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the hot queries and fail unless each one is planned with its intended index. "
+        "On small tables a sequential scan is the right plan, so run this against realistic "
+        "data (e.g. after seed_evaluations) with --analyze."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--department", type=int, help="Department id to plan against (defaults to the first one)")
+        parser.add_argument("--analyze", action="store_true", help="ANALYZE the planned tables first")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plan for every query")
+
+    def handle(self, *args, **options):
+        department_id = options["department"] or Department.objects.values_list("id", flat=True).first() or 1
+        period_id = EvaluationPeriod.objects.values_list("id", flat=True).first() or 1
+        session_id = EvaluationSession.objects.values_list("id", flat=True).first() or 1
+        if options["analyze"]:
+            analyze_tables()
+
+        queries = hot_queries(department_id, period_id, session_id)
+        failures = []
+        for label, expected, indexes, ok in check_plans(department_id, period_id, session_id):
+            if options["verbose_plans"] or not ok:
+                self.stdout.write(f"-- {label}\n{queries[label].explain()}")
+            planned = ", ".join(sorted(indexes)) or "no index"
+            if ok:
+                self.stdout.write(self.style.SUCCESS(f"ok    {label} ({planned})"))
+            else:
+                self.stdout.write(self.style.ERROR(f"MISS  {label}: expected {expected or 'an index'}, planned {planned}"))
+                failures.append(label)
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} hot quer{'y' if len(failures) == 1 else 'ies'} not using the intended index: "
+                f"{', '.join(failures)}"
+            )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from evaluations.models import DepartmentAnalytics, EvaluationPeriod
+
+
+class Command(BaseCommand):
+    help = "Rebuild DepartmentAnalytics rows from scratch to repair drift in the incremental totals"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--period", type=int, help="Only rebuild this period id")
+        parser.add_argument("--department", type=int, help="Only rebuild this department id")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows fetched per round-trip while streaming responses",
+        )
+
+    def handle(self, *args, **options):
+        periods = EvaluationPeriod.objects.all()
+        if options["period"]:
+            periods = periods.filter(id=options["period"])
+
+        for period in periods:
+            rebuilt = DepartmentAnalytics.rebuild(period, options["department"], options["chunk_size"])
+            if rebuilt is None:
+                # Departments whose sessions archive_evaluations removed keep their analytics rows
+                self.stdout.write(f"Skipped {period.name}: no live sessions, existing rows kept.")
+                continue
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} department rows for {period.name}."))
@@ -1,8 +1,27 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.utils import timezone
+
+from authentication.models import Department, AUNUser, EvaluationKey
+from evaluations.models import (
+    EvaluationCategory,
+    EvaluationPeriod,
+    EvaluationQuestion,
+    EvaluationResponse,
+    EvaluationSession,
+)
 
-from authentication.models import Department, AUNUser
-from evaluations.models import EvaluationCategory, EvaluationQuestion
+# Synthetic volume data is namespaced so benchmarks can find it and it never collides
+# with real departments or students.
+BENCH_DEPARTMENT_PREFIX = "BN"
+BENCH_STUDENT_PREFIX = "A0009"
+BENCH_PASSWORD = "Bench-pass-123"
+BENCH_KEY_PREFIX = "BENCH"
 
 
 class Command(BaseCommand):
@@ -14,6 +33,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Also seed categories and sample questions",
         )
+        volume = parser.add_argument_group("volume data (benchmarks / load tests)")
+        volume.add_argument("--departments", type=int, default=0, help="Synthetic departments to create")
+        volume.add_argument("--questions", type=int, default=0, help="Questions per synthetic department")
+        volume.add_argument("--students", type=int, default=0, help="Synthetic verified students")
+        volume.add_argument("--sessions", type=int, default=0, help="Submitted sessions spread over departments")
+        volume.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk insert")
 
     @transaction.atomic
     def handle(self, *args, **options):
@@ -64,6 +89,9 @@ class Command(BaseCommand):
                     self.stdout.write(self.style.SUCCESS(f"Created department {dept.code} - {dept.name}"))
             created_depts.append(dept)
 
+        if any(options[name] for name in ("departments", "questions", "students", "sessions")):
+            self.seed_volume(options)
+
         if not options["with_questions"]:
             self.stdout.write(self.style.SUCCESS("Seeding complete (departments only)."))
             return
@@ -138,3 +166,124 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS("Seeding complete."))
 
 
+
+    def seed_volume(self, options):
+        """Bulk-create synthetic departments, questions, students and submitted sessions."""
+        batch_size = options["batch_size"]
+        rng = random.Random(42)
+
+        departments = []
+        for i in range(1, options["departments"] + 1):
+            dept, _ = Department.objects.get_or_create(
+                code=f"{BENCH_DEPARTMENT_PREFIX}{i:03d}",
+                defaults={"name": f"Benchmark Department {i:03d}", "description": "Synthetic load-test data"},
+            )
+            departments.append(dept)
+        if not departments:
+            departments = list(Department.objects.filter(code__startswith=BENCH_DEPARTMENT_PREFIX))
+        self.stdout.write(self.style.SUCCESS(f"{len(departments)} synthetic departments ready."))
+
+        creator = AUNUser.objects.filter(role="admin").first()
+        existing_students = AUNUser.objects.filter(aun_id__startswith=BENCH_STUDENT_PREFIX).count()
+        password = make_password(BENCH_PASSWORD)  # hash once; PBKDF2 per row would dominate
+        AUNUser.objects.bulk_create(
+            [
+                AUNUser(
+                    aun_id=f"{BENCH_STUDENT_PREFIX}{i:06d}",
+                    username=f"{BENCH_STUDENT_PREFIX}{i:06d}",
+                    aun_email=f"bench{i:06d}@aun.edu.ng",
+                    email=f"bench{i:06d}@aun.edu.ng",
+                    full_name=f"Bench Student {i:06d}",
+                    password=password,
+                    role="student",
+                    is_verified=True,
+                    year_of_study=1 + i % 4,
+                    major="Benchmarking",
+                )
+                for i in range(existing_students, options["students"])
+            ],
+            batch_size=batch_size,
+        )
+        students = list(AUNUser.objects.filter(aun_id__startswith=BENCH_STUDENT_PREFIX))
+        creator = creator or (students[0] if students else None)
+        self.stdout.write(self.style.SUCCESS(f"{len(students)} synthetic students ready."))
+
+        scales = ["likert_5", "likert_5", "likert_10", "boolean", "text"]
+        questions = {}
+        for dept in departments:
+            have = EvaluationQuestion.objects.filter(department=dept).count()
+            EvaluationQuestion.objects.bulk_create(
+                [
+                    EvaluationQuestion(
+                        department=dept,
+                        prompt=f"Synthetic question {i + 1} for {dept.code}",
+                        scale_type=scales[i % len(scales)],
+                        order_index=i + 1,
+                    )
+                    for i in range(have, options["questions"])
+                ],
+                batch_size=batch_size,
+            )
+            questions[dept.id] = list(EvaluationQuestion.objects.filter(department=dept, is_active=True))
+
+        if not options["sessions"]:
+            return
+        if not students or creator is None:
+            self.stdout.write(self.style.WARNING("No students to attach sessions to; skipping sessions."))
+            return
+
+        keys = {}
+        for dept in departments:
+            keys[dept.id], _ = EvaluationKey.objects.get_or_create(
+                key=f"{BENCH_KEY_PREFIX}{dept.id:03d}"[:20],
+                defaults={
+                    "department": dept,
+                    "created_by": creator,
+                    "usage_limit": 10 ** 9,
+                    "valid_until": timezone.now() + timedelta(days=365),
+                    "description": "Synthetic load-test key",
+                },
+            )
+
+        now = timezone.now()
+        sessions = []
+        for i in range(options["sessions"]):
+            dept = departments[i % len(departments)]
+            student = students[i % len(students)]
+            sessions.append(
+                EvaluationSession(
+                    student=student,
+                    department=dept,
+                    evaluation_key=keys[dept.id],
+                    status="submitted",
+                    anonymous_identity=student.get_encrypted_identity() or "",
+                    submitted_at=now - timedelta(minutes=rng.randrange(60 * 24 * 30)),
+                )
+            )
+        sessions = EvaluationSession.objects.bulk_create(sessions, batch_size=batch_size)
+        for period in EvaluationPeriod.objects.all():
+            period.claim_sessions(EvaluationSession.objects.filter(department__in=departments))
+
+        def answers():
+            for session in sessions:
+                for q in questions[session.department_id]:
+                    if q.scale_type == "boolean":
+                        yield EvaluationResponse(session=session, question=q, boolean_answer=rng.random() < 0.5)
+                    elif q.scale_type == "text":
+                        yield EvaluationResponse(session=session, question=q, text_answer="Synthetic comment")
+                    else:
+                        top = 10 if q.scale_type == "likert_10" else 5
+                        yield EvaluationResponse(session=session, question=q, score=rng.randint(1, top))
+
+        batch, total = [], 0
+        for response in answers():
+            batch.append(response)
+            if len(batch) >= batch_size:
+                EvaluationResponse.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        EvaluationResponse.objects.bulk_create(batch)
+        total += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"Seeded {len(sessions)} sessions with {total} responses."))
+
+        call_command("rebuild_department_analytics", stdout=self.stdout)
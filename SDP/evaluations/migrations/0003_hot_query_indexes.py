@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluations", "0002_evaluationperiod_departmentresponse_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="evaluationquestion",
+            index=models.Index(
+                fields=["department", "is_active", "order_index"],
+                name="eval_question_dept_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="evaluationresponse",
+            index=models.Index(
+                condition=models.Q(("score__isnull", False)),
+                fields=["session"],
+                include=("question", "score"),
+                name="eval_response_scored_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="evaluationsession",
+            index=models.Index(
+                condition=models.Q(("status", "submitted")),
+                fields=["department", "-submitted_at", "-id"],
+                name="eval_session_submitted_idx",
+            ),
+        ),
+    ]
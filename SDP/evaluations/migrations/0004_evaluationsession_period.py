@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def assign_periods(apps, schema_editor):
+    EvaluationPeriod = apps.get_model("evaluations", "EvaluationPeriod")
+    EvaluationSession = apps.get_model("evaluations", "EvaluationSession")
+    for period in EvaluationPeriod.objects.order_by("start_date"):
+        in_range = models.Q(
+            submitted_at__date__gte=period.start_date, submitted_at__date__lte=period.end_date
+        ) | models.Q(
+            submitted_at__isnull=True, started_at__date__gte=period.start_date, started_at__date__lte=period.end_date
+        )
+        EvaluationSession.objects.filter(in_range, period__isnull=True).update(period=period)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluations", "0003_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evaluationsession",
+            name="period",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="sessions",
+                to="evaluations.evaluationperiod",
+            ),
+        ),
+        migrations.RunPython(assign_periods, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="evaluationsession",
+            index=models.Index(
+                condition=models.Q(("status", "submitted")),
+                fields=["period", "department", "-submitted_at", "-id"],
+                name="eval_session_period_idx",
+            ),
+        ),
+    ]
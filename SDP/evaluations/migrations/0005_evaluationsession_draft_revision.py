@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluations", "0004_evaluationsession_period"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evaluationsession",
+            name="draft_revision",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
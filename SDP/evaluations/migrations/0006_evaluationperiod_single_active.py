@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+def keep_latest_active(apps, schema_editor):
+    EvaluationPeriod = apps.get_model("evaluations", "EvaluationPeriod")
+    active = EvaluationPeriod.objects.filter(is_active=True).order_by("-start_date", "-id")
+    latest = active.first()
+    if latest is not None:
+        active.exclude(pk=latest.pk).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluations", "0005_evaluationsession_draft_revision"),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_active, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="evaluationperiod",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_active", True)), fields=("is_active",), name="eval_period_single_active"
+            ),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:40
+
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def fold(analytics, rows):
+    """Frozen copy of DepartmentAnalytics.fold for the historical model."""
+    for question_id, category_name, score, text_answer in rows:
+        analytics.total_responses += 1
+        if (text_answer or "").strip():
+            analytics.text_responses_count += 1
+        if score is None:
+            continue
+        entry = analytics.question_averages.setdefault(
+            str(question_id), {"avg": 0, "count": 0, "sum": 0, "distribution": {}, "category": None}
+        )
+        entry["category"] = category_name
+        entry["count"] += 1
+        entry["sum"] += score
+        entry["avg"] = round(entry["sum"] / entry["count"], 2)
+        entry["distribution"][str(score)] = entry["distribution"].get(str(score), 0) + 1
+
+    totals = {}
+    for entry in analytics.question_averages.values():
+        if entry.get("category"):
+            cat_sum, cat_count = totals.get(entry["category"], (0, 0))
+            totals[entry["category"]] = (cat_sum + entry["sum"], cat_count + entry["count"])
+    analytics.category_averages = {name: round(s / c, 2) for name, (s, c) in totals.items()}
+    score_sum = sum(e["sum"] for e in analytics.question_averages.values())
+    score_count = sum(e["count"] for e in analytics.question_averages.values())
+    analytics.average_rating = round(Decimal(score_sum) / score_count, 2) if score_count else None
+
+
+def build_missing_analytics(apps, schema_editor):
+    """Build DepartmentAnalytics rows for submitted history that has none yet."""
+    DepartmentAnalytics = apps.get_model("evaluations", "DepartmentAnalytics")
+    EvaluationSession = apps.get_model("evaluations", "EvaluationSession")
+    EvaluationResponse = apps.get_model("evaluations", "EvaluationResponse")
+
+    existing = set(DepartmentAnalytics.objects.values_list("department_id", "period_id"))
+    groups = (
+        EvaluationSession.objects.filter(status="submitted", period__isnull=False)
+        .order_by()
+        .values_list("department_id", "period_id")
+        .annotate(submissions=Count("id"))
+    )
+    for department_id, period_id, submissions in groups:
+        if (department_id, period_id) in existing:
+            continue
+        analytics = DepartmentAnalytics(
+            department_id=department_id, period_id=period_id, total_submissions=submissions
+        )
+        rows = EvaluationResponse.objects.filter(
+            session__department_id=department_id, session__period_id=period_id, session__status="submitted"
+        ).values_list("question_id", "question__category__name", "score", "text_answer")
+        fold(analytics, rows.iterator(chunk_size=2000))
+        analytics.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluations", "0006_evaluationperiod_single_active"),
+    ]
+
+    operations = [
+        migrations.RunPython(build_missing_analytics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluations", "0007_build_department_analytics"),
+    ]
+
+    operations = [
+        # eval_question_dept_active_idx leads with department, so the FK's own index is redundant
+        migrations.AlterField(
+            model_name="evaluationquestion",
+            name="department",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="questions",
+                to="authentication.department",
+            ),
+        ),
+    ]
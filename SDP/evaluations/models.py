@@ -1,7 +1,78 @@
-from django.db import models
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import models, transaction
 from django.utils import timezone
 
 
+class EvaluationPeriod(models.Model):
+    """Academic term during which evaluations are collected."""
+    SEMESTER_CHOICES = [
+        ("fall", "Fall Semester"),
+        ("spring", "Spring Semester"),
+        ("summer", "Summer Session"),
+    ]
+
+    name = models.CharField(max_length=100, unique=True, help_text="e.g., Fall 2024")
+    semester = models.CharField(max_length=20, choices=SEMESTER_CHOICES)
+    year = models.IntegerField()
+    start_date = models.DateField()
+    end_date = models.DateField()
+    is_active = models.BooleanField(default=False, help_text="Only one period can be active at a time")
+    description = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-year", "-semester"]
+        unique_together = ("semester", "year")
+        indexes = [
+            models.Index(fields=["is_active"]),
+            models.Index(fields=["year", "semester"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["is_active"], condition=models.Q(is_active=True), name="eval_period_single_active"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+    def save(self, *args, **kwargs):
+        """Save, deactivating any other active period, and take over the unassigned sessions in range.
+
+        Sessions submitted before any period covered them have no period, so every read scoped
+        to this period would miss them; they are stamped here and the analytics rebuilt.
+        """
+        with transaction.atomic():
+            if self.is_active:
+                EvaluationPeriod.objects.filter(is_active=True).exclude(pk=self.pk).update(is_active=False)
+            super().save(*args, **kwargs)
+            if self.claim_sessions():
+                DepartmentAnalytics.rebuild(self)
+
+    @classmethod
+    def for_date(cls, day):
+        """Return the period whose date range covers ``day``, if any."""
+        return cls.objects.filter(start_date__lte=day, end_date__gte=day).order_by("-start_date").first()
+
+    @classmethod
+    def current(cls):
+        """The active period, falling back to the one covering today."""
+        return cls.objects.filter(is_active=True).first() or cls.for_date(timezone.localdate())
+
+    def claim_sessions(self, sessions=None) -> int:
+        """Stamp this period onto unassigned sessions submitted (or, if unsubmitted, started) within it."""
+        sessions = (sessions if sessions is not None else EvaluationSession.objects.all()).filter(period__isnull=True)
+        in_range = models.Q(submitted_at__date__gte=self.start_date, submitted_at__date__lte=self.end_date) | models.Q(
+            submitted_at__isnull=True, started_at__date__gte=self.start_date, started_at__date__lte=self.end_date
+        )
+        return sessions.filter(in_range).update(period=self)
+
+
 class EvaluationCategory(models.Model):
     """High-level grouping for questions, e.g., Teaching, Facilities, Support."""
     name = models.CharField(max_length=100, unique=True)
@@ -26,8 +97,9 @@ class EvaluationQuestion(models.Model):
         ("text", "Open Text"),
     ]
 
+    # Indexed by eval_question_dept_active_idx, whose leading column is the department
     department = models.ForeignKey(
-        "authentication.Department", on_delete=models.CASCADE, related_name="questions"
+        "authentication.Department", on_delete=models.CASCADE, related_name="questions", db_index=False
     )
     category = models.ForeignKey(
         EvaluationCategory, on_delete=models.SET_NULL, null=True, blank=True
@@ -49,6 +121,10 @@ class EvaluationQuestion(models.Model):
 
     class Meta:
         ordering = ["department", "order_index", "id"]
+        indexes = [
+            # list_questions / start-of-form: active questions of a department in display order
+            models.Index(fields=["department", "is_active", "order_index"], name="eval_question_dept_active_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"[{self.department.code}] {self.prompt[:60]}"
@@ -69,7 +145,13 @@ class EvaluationSession(models.Model):
     evaluation_key = models.ForeignKey(
         "authentication.EvaluationKey", on_delete=models.PROTECT, related_name="sessions"
     )
+    # Stamped when the session starts so every read can be scoped to one term
+    period = models.ForeignKey(
+        EvaluationPeriod, on_delete=models.PROTECT, null=True, blank=True, related_name="sessions"
+    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="in_progress")
+    # Highest client revision autosaved so far; older or repeated saves are no-ops
+    draft_revision = models.PositiveIntegerField(default=0)
 
     # Pseudonymous identity for analytics and audit without exposing PII
     anonymous_identity = models.CharField(max_length=32, blank=True)
@@ -81,12 +163,34 @@ class EvaluationSession(models.Model):
         ordering = ["-started_at"]
         indexes = [
             models.Index(fields=["department", "status"]),
+            # Keyset pages of submitted sessions, newest first
+            models.Index(
+                fields=["department", "-submitted_at", "-id"],
+                condition=models.Q(status="submitted"),
+                name="eval_session_submitted_idx",
+            ),
+            # The same pages scoped to a single term
+            models.Index(
+                fields=["period", "department", "-submitted_at", "-id"],
+                condition=models.Q(status="submitted"),
+                name="eval_session_period_idx",
+            ),
         ]
 
-    def mark_submitted(self):
-        self.status = "submitted"
-        self.submitted_at = timezone.now()
-        self.save(update_fields=["status", "submitted_at"])
+    def mark_submitted(self) -> bool:
+        """Submit an in-progress session and fold it into analytics; False if it was already submitted."""
+        submitted_at = timezone.now()
+        fields = {"status": "submitted", "submitted_at": submitted_at}
+        if self.period_id is None:
+            # Started before any period covered it; file it under the term it was submitted in
+            fields["period"] = EvaluationPeriod.for_date(timezone.localdate(submitted_at))
+        # Conditional UPDATE: of two concurrent submits only one claims the row and is counted
+        if not EvaluationSession.objects.filter(pk=self.pk, status="in_progress").update(**fields):
+            return False
+        for name, value in fields.items():
+            setattr(self, name, value)
+        DepartmentAnalytics.record_submission(self)
+        return True
 
 
 class EvaluationResponse(models.Model):
@@ -106,6 +210,15 @@ class EvaluationResponse(models.Model):
     class Meta:
         unique_together = ("session", "question")
         ordering = ["question__order_index", "question_id"]
+        indexes = [
+            # Score aggregates only read numeric answers; covering on Postgres
+            models.Index(
+                fields=["session"],
+                include=["question", "score"],
+                condition=models.Q(score__isnull=False),
+                name="eval_response_scored_idx",
+            ),
+        ]
 
 
 class StaffResponse(models.Model):
@@ -123,3 +236,142 @@ class StaffResponse(models.Model):
         ordering = ["-created_at"]
 
 
+
+
+class DepartmentAnalytics(models.Model):
+    """Running per-department totals for a period, folded in as sessions are submitted."""
+    department = models.ForeignKey(
+        "authentication.Department", on_delete=models.CASCADE, related_name="analytics"
+    )
+    period = models.ForeignKey(
+        EvaluationPeriod, on_delete=models.CASCADE, related_name="department_analytics"
+    )
+
+    total_submissions = models.IntegerField(default=0)
+    total_responses = models.IntegerField(default=0)
+    average_rating = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    question_averages = models.JSONField(
+        default=dict, help_text="Dict of {question_id: {avg, count, distribution}}"
+    )
+    category_averages = models.JSONField(default=dict, help_text="Dict of {category_name: avg_score}")
+    text_responses_count = models.IntegerField(default=0)
+    common_keywords = models.JSONField(
+        default=list, help_text="List of most common words from text responses"
+    )
+
+    last_calculated = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "Department Analytics"
+        ordering = ["-period__year", "-period__semester", "department"]
+        unique_together = ("department", "period")
+        indexes = [
+            models.Index(fields=["department", "period"]),
+            models.Index(fields=["period"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.department_id} / {self.period_id}"
+
+    @staticmethod
+    def response_rows(responses):
+        """Project a response queryset onto the columns ``fold`` consumes."""
+        return responses.values_list("question_id", "question__category__name", "score", "text_answer")
+
+    def fold(self, rows, submissions: int = 0):
+        """Add (question_id, category_name, score, text_answer) rows to the running totals.
+
+        Each question entry keeps its score sum next to avg/count so later submissions
+        can be added without rescanning earlier responses.
+        """
+        self.total_submissions += submissions
+        for question_id, category_name, score, text_answer in rows:
+            self.total_responses += 1
+            if (text_answer or "").strip():
+                self.text_responses_count += 1
+            if score is None:
+                continue
+            entry = self.question_averages.setdefault(
+                str(question_id), {"avg": 0, "count": 0, "sum": 0, "distribution": {}, "category": None}
+            )
+            entry["category"] = category_name
+            entry["count"] += 1
+            entry["sum"] += score
+            entry["avg"] = round(entry["sum"] / entry["count"], 2)
+            entry["distribution"][str(score)] = entry["distribution"].get(str(score), 0) + 1
+        self._recompute_rollups()
+
+    def _recompute_rollups(self):
+        totals = {}
+        for entry in self.question_averages.values():
+            if entry.get("category"):
+                cat_sum, cat_count = totals.get(entry["category"], (0, 0))
+                totals[entry["category"]] = (cat_sum + entry["sum"], cat_count + entry["count"])
+        self.category_averages = {name: round(s / c, 2) for name, (s, c) in totals.items()}
+
+        score_sum = sum(e["sum"] for e in self.question_averages.values())
+        score_count = sum(e["count"] for e in self.question_averages.values())
+        self.average_rating = round(Decimal(score_sum) / score_count, 2) if score_count else None
+
+    @classmethod
+    def compute(cls, department_id, period):
+        """Unsaved row aggregated live from the period's submitted sessions of one department."""
+        sessions = EvaluationSession.objects.filter(department_id=department_id, period=period, status="submitted")
+        analytics = cls(department_id=department_id, period=period)
+        analytics.fold(
+            cls.response_rows(EvaluationResponse.objects.filter(session__in=sessions)), submissions=sessions.count()
+        )
+        return analytics
+
+    @classmethod
+    def rebuild(cls, period, department_id=None, chunk_size=2000):
+        """Recompute a period's rows from its live submitted sessions; returns the rows written.
+
+        Departments without live sessions in the period (e.g. archived ones) keep their
+        rows, and None is returned when the whole period has none.
+        """
+        live = EvaluationSession.objects.filter(period=period)
+        if department_id:
+            live = live.filter(department_id=department_id)
+        live_departments = set(live.order_by().values_list("department_id", flat=True).distinct())
+        if not live_departments:
+            return None
+        sessions = live.filter(status="submitted")
+
+        rows = {}
+        submission_counts = {}
+        for session_department_id in sessions.values_list("department_id", flat=True).iterator():
+            submission_counts[session_department_id] = submission_counts.get(session_department_id, 0) + 1
+            rows.setdefault(session_department_id, cls(department_id=session_department_id, period=period))
+
+        responses = (
+            EvaluationResponse.objects.filter(session__in=sessions)
+            .order_by("session__department_id")
+            .values_list("session__department_id", "question_id", "question__category__name", "score", "text_answer")
+        )
+        stream = responses.iterator(chunk_size=chunk_size)
+        for session_department_id, group in groupby(stream, key=itemgetter(0)):
+            rows[session_department_id].fold(row[1:] for row in group)
+
+        with transaction.atomic():
+            cls.objects.filter(period=period, department_id__in=live_departments).delete()
+            for session_department_id, analytics in rows.items():
+                analytics.total_submissions = submission_counts[session_department_id]
+                analytics.save()
+        return len(rows)
+
+    @classmethod
+    def record_submission(cls, session):
+        """Fold a freshly submitted session into its department/period row."""
+        period = session.period
+        if period is None:
+            return None
+
+        with transaction.atomic():
+            cls.objects.get_or_create(department_id=session.department_id, period=period)
+            # Lock the row so concurrent submissions for the department serialize here.
+            analytics = cls.objects.select_for_update().get(department_id=session.department_id, period=period)
+            analytics.fold(cls.response_rows(session.responses.all()), submissions=1)
+            analytics.save()
+        return analytics
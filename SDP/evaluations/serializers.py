@@ -1,5 +1,19 @@
 from rest_framework import serializers
-from .models import EvaluationCategory, EvaluationQuestion, EvaluationSession, EvaluationResponse, StaffResponse
+from .models import EvaluationCategory, EvaluationPeriod, EvaluationQuestion, EvaluationSession, EvaluationResponse, StaffResponse
+
+
+class EvaluationPeriodSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EvaluationPeriod
+        fields = ["id", "name", "semester", "year", "start_date", "end_date", "is_active", "description", "created_at"]
+        read_only_fields = ["created_at"]
+
+    def validate(self, attrs):
+        start = attrs.get("start_date", getattr(self.instance, "start_date", None))
+        end = attrs.get("end_date", getattr(self.instance, "end_date", None))
+        if start and end and end < start:
+            raise serializers.ValidationError({"end_date": "End date must not be before the start date."})
+        return attrs
 
 
 class EvaluationCategorySerializer(serializers.ModelSerializer):
@@ -24,6 +38,21 @@ class EvaluationQuestionSerializer(serializers.ModelSerializer):
         ]
 
 
+class QuestionImportSerializer(serializers.Serializer):
+    """One row of a bulk question import; the category may be given by id or by name."""
+    category_id = serializers.IntegerField(required=False, allow_null=True)
+    category = serializers.CharField(required=False, allow_blank=True)
+    prompt = serializers.CharField()
+    scale_type = serializers.ChoiceField(choices=EvaluationQuestion.SCALE_TYPES, default="likert_5")
+    order_index = serializers.IntegerField(required=False, min_value=0)
+    is_active = serializers.BooleanField(default=True)
+
+
+class QuestionOrderSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    order_index = serializers.IntegerField(min_value=0)
+
+
 class EvaluationResponseInputSerializer(serializers.Serializer):
     question_id = serializers.IntegerField()
     score = serializers.IntegerField(required=False, allow_null=True)
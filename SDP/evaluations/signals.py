@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache as question_cache
+from .models import EvaluationCategory, EvaluationQuestion
+
+
+@receiver([post_save, post_delete], sender=EvaluationQuestion)
+def invalidate_question_list(sender, instance, **kwargs):
+    """Drop cached question lists for the question's department."""
+    question_cache.invalidate_department(instance.department_id)
+
+
+@receiver([post_save, post_delete], sender=EvaluationCategory)
+def invalidate_category_lists(sender, instance, **kwargs):
+    """Categories are nested in every serialized question, so all lists go stale."""
+    question_cache.invalidate_categories()
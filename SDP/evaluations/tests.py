@@ -0,0 +1,194 @@
+import random
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import DateTimeField, ExpressionWrapper, F, Value
+from django.test import TestCase
+from django.utils import timezone
+
+from authentication.models import AUNUser, Department, EvaluationKey, LoginAttempt
+from evaluations.management.commands.check_query_plans import analyze_tables, check_plans
+from evaluations.models import (
+    DepartmentAnalytics,
+    EvaluationCategory,
+    EvaluationPeriod,
+    EvaluationQuestion,
+    EvaluationResponse,
+    EvaluationSession,
+)
+
+
+class EvaluationFlowTestCase(TestCase):
+    """A department with scored and open questions, a key, an active period and a verified student."""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        cls.department = Department.objects.create(name="Cafeteria", code="CAF")
+        cls.admin = AUNUser.objects.create_user("A0001", "admin@aun.edu.ng", "Admin", "pw", role="admin")
+        cls.student = AUNUser.objects.create_user(
+            "A0002", "student@aun.edu.ng", "Student", "pw", role="student", is_verified=True
+        )
+        food = EvaluationCategory.objects.create(name="Food Quality")
+        service = EvaluationCategory.objects.create(name="Service")
+        cls.questions = [
+            EvaluationQuestion.objects.create(department=cls.department, category=food, prompt="Taste", order_index=1),
+            EvaluationQuestion.objects.create(department=cls.department, category=service, prompt="Staff", order_index=2),
+            EvaluationQuestion.objects.create(
+                department=cls.department, prompt="Comments", scale_type="text", order_index=3
+            ),
+        ]
+        cls.key = EvaluationKey.objects.create(
+            key="ABCDEFGH", department=cls.department, created_by=cls.admin,
+            valid_until=timezone.now() + timedelta(days=1),
+        )
+        cls.period = EvaluationPeriod.objects.create(
+            name="Fall", semester="fall", year=today.year,
+            start_date=today - timedelta(days=30), end_date=today + timedelta(days=30), is_active=True,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.student)
+
+    def post(self, path, data, **headers):
+        return self.client.post(path, data, content_type="application/json", headers=headers)
+
+    def start(self):
+        response = self.post("/eval/start/", {"department_id": self.department.id, "key": self.key.key})
+        self.assertEqual(response.status_code, 201)
+        return response.json()["data"]["session_id"]
+
+    def answers(self, taste, staff, comment=""):
+        taste_question, staff_question, comment_question = self.questions
+        return [
+            {"question_id": taste_question.id, "score": taste},
+            {"question_id": staff_question.id, "score": staff},
+            {"question_id": comment_question.id, "text_answer": comment},
+        ]
+
+    def submit(self, session_id, responses, **headers):
+        return self.post("/eval/submit/", {"session_id": session_id, "responses": responses}, **headers)
+
+
+class SubmitEvaluationTests(EvaluationFlowTestCase):
+    def test_duplicate_submit_counts_once(self):
+        session_id = self.start()
+
+        first = self.submit(session_id, self.answers(4, 5, "Great"))
+        second = self.submit(session_id, self.answers(1, 1))
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 400)
+        analytics = DepartmentAnalytics.objects.get(department=self.department, period=self.period)
+        self.assertEqual(analytics.total_submissions, 1)
+        self.assertEqual(analytics.total_responses, 3)
+        self.assertEqual(sorted(EvaluationResponse.objects.values_list("score", flat=True), key=str), [4, 5, None])
+        session = EvaluationSession.objects.get(id=session_id)
+        self.assertFalse(session.mark_submitted())
+        analytics.refresh_from_db()
+        self.assertEqual(analytics.total_submissions, 1)
+
+
+class IdempotencyTests(EvaluationFlowTestCase):
+    def test_replay_returns_stored_response(self):
+        body = {"department_id": self.department.id, "key": self.key.key}
+
+        first = self.post("/eval/start/", body, **{"Idempotency-Key": "start-1"})
+        replay = self.post("/eval/start/", body, **{"Idempotency-Key": "start-1"})
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(EvaluationSession.objects.count(), 1)
+        self.key.refresh_from_db()
+        self.assertEqual(self.key.usage_count, 1)
+
+    def test_key_reused_with_a_different_body_is_rejected(self):
+        session_id = self.start()
+        self.assertEqual(self.submit(session_id, self.answers(4, 5), **{"Idempotency-Key": "submit-1"}).status_code, 200)
+
+        response = self.submit(session_id, self.answers(1, 2), **{"Idempotency-Key": "submit-1"})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(sorted(EvaluationResponse.objects.exclude(score=None).values_list("score", flat=True)), [4, 5])
+
+
+class DepartmentAnalyticsFoldTests(EvaluationFlowTestCase):
+    def test_incremental_fold_matches_recomputation(self):
+        for taste, staff, comment in [(5, 4, "Tasty"), (3, 2, ""), (1, 5, "Slow service"), (4, 4, " ")]:
+            self.assertEqual(self.submit(self.start(), self.answers(taste, staff, comment)).status_code, 200)
+        self.start()  # never submitted, so not counted
+
+        folded = DepartmentAnalytics.objects.get(department=self.department, period=self.period)
+        recomputed = DepartmentAnalytics.compute(self.department.id, self.period)
+
+        for field in (
+            "total_submissions",
+            "total_responses",
+            "average_rating",
+            "question_averages",
+            "category_averages",
+            "text_responses_count",
+        ):
+            with self.subTest(field):
+                self.assertEqual(getattr(folded, field), getattr(recomputed, field))
+        self.assertEqual(folded.total_submissions, 4)
+        self.assertEqual(folded.text_responses_count, 2)
+        self.assertEqual(folded.category_averages, {"Food Quality": 3.25, "Service": 3.75})
+
+
+@skipUnless(connection.vendor == "postgresql", "index names are checked against the PostgreSQL planner")
+class HotQueryPlanTests(TestCase):
+    """Each hot query is planned with its own index once the tables hold realistic volumes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        cls.period = EvaluationPeriod.objects.create(
+            name="Plan check", semester="fall", year=today.year,
+            start_date=today - timedelta(days=60), end_date=today, is_active=True,
+        )
+        call_command(
+            "seed_evaluations", departments=40, questions=20, students=400, sessions=6000, stdout=StringIO()
+        )
+        cls.department = Department.objects.order_by("id").first()
+        cls.session = EvaluationSession.objects.order_by("id").first()
+
+        rng = random.Random(7)
+        creator = cls.session.student
+        now = timezone.now()
+        EvaluationKey.objects.bulk_create(
+            EvaluationKey(
+                key=f"PLAN{i:06d}",
+                department=department,
+                created_by=creator,
+                valid_until=now + timedelta(days=30),
+            )
+            for i, department in enumerate(list(Department.objects.all()) * 50)
+        )
+        # Mostly successful logins, one every ~2 minutes for a month
+        LoginAttempt.objects.bulk_create(
+            LoginAttempt(aun_id=f"A000{i % 5000:05d}", ip_address=f"10.0.{i % 200}.1", success=rng.random() < 0.9)
+            for i in range(20000)
+        )
+        # timestamp is auto_now_add, so spread the rows out afterwards
+        LoginAttempt.objects.update(
+            timestamp=ExpressionWrapper(
+                Value(now) - F("id") % 20000 * Value(timedelta(seconds=130)), output_field=DateTimeField()
+            )
+        )
+        analyze_tables()
+
+    def test_hot_queries_use_their_indexes(self):
+        for label, expected, indexes, ok in check_plans(self.department.id, self.period.id, self.session.id):
+            with self.subTest(label):
+                if expected:
+                    self.assertIn(expected, indexes)
+                else:
+                    self.assertTrue(indexes, "planned without any index")
@@ -7,13 +7,20 @@ urlpatterns = [
     path("questions/", views.list_questions, name="list_questions"),
     path("start/", views.start_evaluation, name="start_evaluation"),
     path("submit/", views.submit_evaluation, name="submit_evaluation"),
+    path("session/<int:session_id>/draft/", views.save_draft, name="save_draft"),
     path("department/<int:department_id>/analytics/", views.department_analytics, name="department_analytics"),
+    path("department/<int:department_id>/analytics/report/", views.department_report, name="department_report"),
     path("session/<int:session_id>/respond/", views.staff_respond, name="staff_respond"),
     path("department/<int:department_id>/sessions/", views.list_department_sessions, name="list_department_sessions"),
     path("session/<int:session_id>/", views.session_detail, name="session_detail"),
     path("department/<int:department_id>/export.csv", views.export_department_csv, name="export_department_csv"),
     path("questions/manage/", views.manage_questions, name="manage_questions"),
     path("questions/<int:question_id>/", views.question_detail, name="question_detail"),
+    path("questions/bulk/", views.bulk_questions, name="bulk_questions"),
+    path("periods/", views.manage_periods, name="manage_periods"),
+    path("periods/<int:period_id>/", views.period_detail, name="period_detail"),
+    path("periods/<int:period_id>/set-active/", views.set_active_period, name="set_active_period"),
+    path("department/<int:department_id>/questions/export.csv", views.export_questions_csv, name="export_questions_csv"),
 ]
 
 
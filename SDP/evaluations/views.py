@@ -1,55 +1,87 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.db import transaction
+from django.db.models import Avg, Exists, Max, OuterRef, Q
 from django.shortcuts import get_object_or_404
-from django.http import JsonResponse
+from django.http import Http404, HttpResponseNotModified, JsonResponse
 from django.utils import timezone
-from django.views.decorators.http import require_http_methods
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET, require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+import binascii
 import csv
+import io
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from itertools import groupby, islice
+from operator import itemgetter
 
 from authentication.decorators import ajax_login_required, ajax_role_required
+from backend.routers import read_from_replica
 from authentication.models import Department, EvaluationKey, AUNUser
-from authentication.utils import encrypt_for_anonymity
 
+from . import cache as question_cache
+from .analytics import build_department_report
+from .idempotency import idempotent
 from .models import (
+    DepartmentAnalytics,
     EvaluationCategory,
+    EvaluationPeriod,
     EvaluationQuestion,
     EvaluationSession,
     EvaluationResponse,
     StaffResponse,
 )
 from .serializers import (
+    EvaluationPeriodSerializer,
     EvaluationQuestionSerializer,
     EvaluationResponseInputSerializer,
+    QuestionImportSerializer,
+    QuestionOrderSerializer,
     StaffResponseSerializer,
 )
 
 
-@api_view(["GET"])
-@permission_classes([AllowAny])
-def list_questions(request):
-    """Public: list active questions for a department (optional by category)."""
+@require_GET
+async def list_questions(request):
+    """Public: list active questions for a department (optional by category). Async, served under ASGI."""
     department_id = request.GET.get("department_id")
     if not department_id:
-        return Response({"success": False, "message": "department_id is required"}, status=400)
+        return JsonResponse({"success": False, "message": "department_id is required"}, status=400)
 
     category_id = request.GET.get("category_id")
-    qs = EvaluationQuestion.objects.filter(department_id=department_id, is_active=True)
-    if category_id:
-        qs = qs.filter(category_id=category_id)
+    if not str(department_id).isdigit() or (category_id and not str(category_id).isdigit()):
+        return JsonResponse(
+            {"success": False, "message": "department_id and category_id must be integers"}, status=400
+        )
 
-    data = EvaluationQuestionSerializer(qs.order_by("order_index", "id"), many=True).data
-    return Response({"success": True, "data": {"questions": data, "count": len(data)}})
+    async def build():
+        qs = EvaluationQuestion.objects.filter(department_id=department_id, is_active=True).select_related("category")
+        if category_id:
+            qs = qs.filter(category_id=category_id)
+        questions = [q async for q in qs.order_by("order_index", "id")]
+        data = EvaluationQuestionSerializer(questions, many=True).data
+        return {"questions": data, "count": len(data)}
+
+    payload, etag = await question_cache.aget_question_list(int(department_id), category_id, build)
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse({"success": True, "data": payload})
+    response["ETag"] = etag
+    return response
 
 
 @csrf_exempt
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@idempotent
 def start_evaluation(request):
     """Student: start an evaluation session after validating key."""
     user: AUNUser = request.user
@@ -62,19 +94,22 @@ def start_evaluation(request):
         return Response({"success": False, "message": "department_id and key are required."}, status=400)
 
     department = get_object_or_404(Department, id=department_id, is_active=True)
-    try:
-        eval_key = EvaluationKey.objects.get(key=key, department=department)
-    except EvaluationKey.DoesNotExist:
-        return Response({"success": False, "message": "Invalid evaluation key for department."}, status=400)
-
-    if not eval_key.is_valid:
-        return Response({"success": False, "message": "Evaluation key expired or over limit."}, status=400)
 
     with transaction.atomic():
-        eval_key.use_key()
+        # Conditional UPDATE: the limit holds even when a whole class starts at once
+        key_id = EvaluationKey.objects.consume(key, department.id)
+        if key_id is None:
+            if not EvaluationKey.objects.filter(key=key, department=department).exists():
+                return Response({"success": False, "message": "Invalid evaluation key for department."}, status=400)
+            return Response({"success": False, "message": "Evaluation key expired or over limit."}, status=400)
+
         anon = user.get_encrypted_identity() or ""
         session = EvaluationSession.objects.create(
-            student=user, department=department, evaluation_key=eval_key, anonymous_identity=anon
+            student=user,
+            department=department,
+            evaluation_key_id=key_id,
+            period=EvaluationPeriod.current(),
+            anonymous_identity=anon,
         )
 
     return Response({
@@ -87,8 +122,9 @@ def start_evaluation(request):
 @csrf_exempt
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@idempotent
 def submit_evaluation(request):
-    """Student: submit evaluation answers for a session."""
+    """Student: submit evaluation answers for a session (any not already saved as a draft)."""
     user: AUNUser = request.user
     session_id = request.data.get("session_id")
     responses = request.data.get("responses", [])
@@ -100,37 +136,148 @@ def submit_evaluation(request):
     if session.status == "submitted":
         return Response({"success": False, "message": "Session already submitted."}, status=400)
 
-    # Ensure questions belong to the department
-    question_ids = [r.get("question_id") for r in responses if r.get("question_id")]
+    # Validate the whole payload in one pass
+    ser = EvaluationResponseInputSerializer(data=responses, many=True)
+    ser.is_valid(raise_exception=True)
+
+    invalid = _first_invalid_question(session, ser.validated_data)
+    if invalid is not None:
+        return Response({"success": False, "message": f"Invalid question {invalid} for department."}, status=400)
+
+    with transaction.atomic():
+        # A concurrent submit of the same session waits on this lock, then finds it submitted
+        if not EvaluationSession.objects.select_for_update().filter(id=session.id, status="in_progress").exists():
+            return Response({"success": False, "message": "Session already submitted."}, status=400)
+        # Answers already autosaved through save_draft only need the status flip
+        inserted, updated = _upsert_responses(session, ser.validated_data)
+        if not session.mark_submitted():
+            transaction.set_rollback(True)
+            return Response({"success": False, "message": "Session already submitted."}, status=400)
+
+    return Response({
+        "success": True,
+        "message": "Evaluation submitted.",
+        "data": {"inserted": inserted, "updated": updated},
+    })
+
+
+@csrf_exempt
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+def save_draft(request, session_id: int):
+    """Student: autosave changed answers of an in-progress session; GET returns the saved draft."""
+    user: AUNUser = request.user
+    session = get_object_or_404(
+        EvaluationSession.objects.only("id", "department_id", "status", "draft_revision"),
+        id=session_id,
+        student=user,
+    )
+
+    if request.method == "GET":
+        responses = EvaluationResponse.objects.filter(session=session).order_by("question_id").values(
+            "question_id", "score", "boolean_answer", "text_answer"
+        )
+        return Response({
+            "success": True,
+            "data": {"revision": session.draft_revision, "status": session.status, "responses": list(responses)},
+        })
+
+    responses = request.data.get("responses", [])
+    try:
+        revision = int(request.data.get("revision"))
+    except (TypeError, ValueError):
+        revision = 0
+    if revision < 1 or not isinstance(responses, list):
+        return Response({"success": False, "message": "revision (>= 1) and responses[] are required."}, status=400)
+
+    # Retries and out-of-order saves are answered before any validation or write
+    stale = _stale_draft(session, revision)
+    if stale is not None:
+        return stale
+
+    ser = EvaluationResponseInputSerializer(data=responses, many=True)
+    ser.is_valid(raise_exception=True)
+    invalid = _first_invalid_question(session, ser.validated_data)
+    if invalid is not None:
+        return Response({"success": False, "message": f"Invalid question {invalid} for department."}, status=400)
+
+    with transaction.atomic():
+        # Conditional UPDATE claims the revision, so concurrent retries write the delta once
+        claimed = EvaluationSession.objects.filter(
+            id=session.id, status="in_progress", draft_revision__lt=revision
+        ).update(draft_revision=revision)
+        if claimed:
+            inserted, updated = _upsert_responses(session, ser.validated_data)
+
+    if not claimed:
+        session.refresh_from_db(fields=["status", "draft_revision"])
+        return _stale_draft(session, revision)
+
+    return Response({
+        "success": True,
+        "message": "Draft saved.",
+        "data": {"revision": revision, "saved": True, "inserted": inserted, "updated": updated},
+    })
+
+
+def _stale_draft(session: EvaluationSession, revision: int):
+    """Response for a draft save that must not be applied, or None when ``revision`` is new."""
+    if session.status != "in_progress":
+        return Response({"success": False, "message": "Session is no longer in progress."}, status=400)
+    if revision <= session.draft_revision:
+        return Response({
+            "success": True,
+            "message": "Draft already saved.",
+            "data": {"revision": session.draft_revision, "saved": False},
+        })
+    return None
+
+
+def _first_invalid_question(session: EvaluationSession, answers):
+    """Return the lowest answered question id that is not an active question of the session's department."""
+    question_ids = {a["question_id"] for a in answers}
+    if not question_ids:
+        return None
     valid_questions = set(
         EvaluationQuestion.objects.filter(
-            id__in=question_ids, department=session.department, is_active=True
+            id__in=question_ids, department_id=session.department_id, is_active=True
         ).values_list("id", flat=True)
     )
+    invalid = sorted(question_ids - valid_questions)
+    return invalid[0] if invalid else None
 
-    with transaction.atomic():
-        for r in responses:
-            ser = EvaluationResponseInputSerializer(data=r)
-            ser.is_valid(raise_exception=True)
-            qid = ser.validated_data["question_id"]
-            if qid not in valid_questions:
-                return Response({"success": False, "message": f"Invalid question {qid} for department."}, status=400)
-
-            EvaluationResponse.objects.update_or_create(
+
+def _upsert_responses(session: EvaluationSession, answers) -> tuple[int, int]:
+    """Write validated answers for a session with a single upsert; returns (inserted, updated)."""
+    # Last answer wins when a question appears twice, as with sequential update_or_create.
+    # Postgres also refuses to touch the same row twice in one ON CONFLICT statement.
+    by_question = {a["question_id"]: a for a in answers}
+    if not by_question:
+        return 0, 0
+
+    existing = set(
+        EvaluationResponse.objects.filter(session=session, question_id__in=by_question)
+        .values_list("question_id", flat=True)
+    )
+    EvaluationResponse.objects.bulk_create(
+        [
+            EvaluationResponse(
                 session=session,
                 question_id=qid,
-                defaults={
-                    "score": ser.validated_data.get("score"),
-                    "boolean_answer": ser.validated_data.get("boolean_answer"),
-                    "text_answer": ser.validated_data.get("text_answer", ""),
-                },
+                score=a.get("score"),
+                boolean_answer=a.get("boolean_answer"),
+                text_answer=a.get("text_answer", ""),
             )
-
-        session.mark_submitted()
-
-    return Response({"success": True, "message": "Evaluation submitted."})
+            for qid, a in by_question.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["session", "question"],
+        update_fields=["score", "boolean_answer", "text_answer"],
+    )
+    return len(by_question) - len(existing), len(existing)
 
 
+@read_from_replica
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def department_analytics(request, department_id: int):
@@ -139,13 +286,74 @@ def department_analytics(request, department_id: int):
     if not (user.is_admin or (user.is_staff_member and user.department_id == department_id)):
         return Response({"success": False, "message": "Forbidden."}, status=403)
 
-    # Aggregations
+    period = _requested_period(request)
+    if period is None:
+        return _live_department_analytics(department_id)
+
+    # Precomputed row, kept current by EvaluationSession.mark_submitted
+    analytics = DepartmentAnalytics.objects.filter(department_id=department_id, period=period).first()
+    if analytics is None:
+        # Not built yet (e.g. history from before analytics rows existed): aggregate live
+        analytics = DepartmentAnalytics.compute(department_id, period)
+
+    prompts = dict(
+        EvaluationQuestion.objects.filter(id__in=analytics.question_averages.keys()).values_list("id", "prompt")
+    )
+    avg_list = [
+        {
+            "question_id": int(qid),
+            "prompt": prompts.get(int(qid), ""),
+            "avg_score": entry["avg"],
+            "count": entry["count"],
+            "distribution": entry["distribution"],
+        }
+        for qid, entry in sorted(analytics.question_averages.items(), key=lambda item: int(item[0]))
+    ]
+
+    return Response({
+        "success": True,
+        "data": {
+            "period": {"id": period.id, "name": period.name},
+            "total_submissions": analytics.total_submissions,
+            "total_responses": analytics.total_responses,
+            "text_responses_count": analytics.text_responses_count,
+            "average_rating": analytics.average_rating,
+            "question_averages": avg_list,
+            "category_averages": analytics.category_averages,
+            "last_calculated": analytics.last_calculated.isoformat() if analytics.last_calculated else None,
+        },
+    })
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def department_report(request, department_id: int):
+    """Staff/Head/Admin: per-question distributions and category comparisons for a period."""
+    user: AUNUser = request.user
+    if not (user.is_admin or (user.is_staff_member and user.department_id == department_id)):
+        return Response({"success": False, "message": "Forbidden."}, status=403)
+
+    period = _requested_period(request)
+    return Response({"success": True, "data": build_department_report(department_id, period)})
+
+
+def _requested_period(request):
+    """Resolve ``?period_id``: a period id, ``all`` for every term, or the current period by default."""
+    period_id = request.GET.get("period_id")
+    if period_id == "all":
+        return None
+    if period_id:
+        if not period_id.isdigit():
+            raise Http404("Unknown evaluation period.")
+        return get_object_or_404(EvaluationPeriod, id=period_id)
+    return EvaluationPeriod.current()
+
+
+def _live_department_analytics(department_id: int):
+    """Fallback when no period is configured or ``period_id=all``: aggregate straight from responses."""
     sessions = EvaluationSession.objects.filter(department_id=department_id, status="submitted")
     total_sessions = sessions.count()
 
-    # Average score per question
-    from django.db.models import Avg
-
     averages = (
         EvaluationResponse.objects.filter(session__in=sessions, score__isnull=False)
         .values("question_id", "question__prompt")
@@ -161,6 +369,7 @@ def department_analytics(request, department_id: int):
     return Response({
         "success": True,
         "data": {
+            "period": None,
             "total_submissions": total_sessions,
             "question_averages": avg_list,
         },
@@ -191,6 +400,7 @@ def staff_respond(request, session_id: int):
     return Response({"success": True, "data": {"id": sr.id, "created_at": sr.created_at}})
 
 
+@read_from_replica
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def list_department_sessions(request, department_id: int):
@@ -199,34 +409,90 @@ def list_department_sessions(request, department_id: int):
     if not (user.is_admin or (user.is_staff_member and user.department_id == department_id)):
         return Response({"success": False, "message": "Forbidden."}, status=403)
 
-    sessions = (
-        EvaluationSession.objects.filter(department_id=department_id, status="submitted")
-        .select_related("student")
-        .order_by("-submitted_at")
+    try:
+        limit = min(max(int(request.GET.get("limit", SESSIONS_PAGE_SIZE)), 1), SESSIONS_MAX_PAGE_SIZE)
+        cursor = _decode_session_cursor(request.GET.get("cursor"))
+    except (TypeError, ValueError):
+        return Response({"success": False, "message": "Invalid limit or cursor."}, status=400)
+
+    period = _requested_period(request)
+    submitted = EvaluationSession.objects.filter(department_id=department_id, status="submitted")
+    if period is not None:
+        submitted = submitted.filter(period=period)
+    sessions = submitted.annotate(
+        has_staff_response=Exists(StaffResponse.objects.filter(session=OuterRef("pk")))
+    ).order_by("-submitted_at", "-id")
+    if cursor:
+        submitted_at, last_id = cursor
+        sessions = sessions.filter(
+            Q(submitted_at__lt=submitted_at) | Q(submitted_at=submitted_at, id__lt=last_id)
+        )
+
+    # One extra row tells us whether another page exists without counting
+    page = list(
+        sessions.values("id", "submitted_at", "anonymous_identity", "has_staff_response", "student__role")[:limit + 1]
     )
+    has_more = len(page) > limit
+    page = page[:limit]
 
     data = [
         {
-            "id": s.id,
-            "submitted_at": s.submitted_at.isoformat() if s.submitted_at else None,
-            "anonymous_identity": s.anonymous_identity,
-            "has_staff_response": hasattr(s, "staff_response"),
-            "student_role": s.student.role,
+            "id": s["id"],
+            "submitted_at": s["submitted_at"].isoformat() if s["submitted_at"] else None,
+            "anonymous_identity": s["anonymous_identity"],
+            "has_staff_response": s["has_staff_response"],
+            "student_role": s["student__role"],
         }
-        for s in sessions
+        for s in page
     ]
 
-    return Response({"success": True, "data": {"sessions": data, "count": len(data)}})
+    include_total = request.GET.get("include_total", "").lower() in ("1", "true", "yes")
+    return Response({
+        "success": True,
+        "data": {
+            "period": {"id": period.id, "name": period.name} if period is not None else None,
+            "sessions": data,
+            "count": len(data),
+            "next_cursor": _encode_session_cursor(page[-1]) if has_more else None,
+            "total": submitted.count() if include_total else None,
+        },
+    })
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-def session_detail(request, session_id: int):
-    """Staff/Head/Admin: get responses of a specific session."""
-    user: AUNUser = request.user
-    session = get_object_or_404(EvaluationSession.objects.select_related("department"), id=session_id)
+SESSIONS_PAGE_SIZE = 50
+SESSIONS_MAX_PAGE_SIZE = 200
+
+
+def _encode_session_cursor(row) -> str:
+    raw = f"{row['submitted_at'].isoformat()}|{row['id']}"
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_session_cursor(cursor):
+    """Turn an opaque cursor back into the (submitted_at, id) keyset position."""
+    if not cursor:
+        return None
+    try:
+        raw = urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("malformed cursor") from exc
+    submitted_at, _, last_id = raw.partition("|")
+    parsed = datetime.fromisoformat(submitted_at)
+    return parsed, int(last_id)
+
+
+@read_from_replica
+@require_GET
+@ajax_login_required
+async def session_detail(request, session_id: int):
+    """Staff/Head/Admin: get responses of a specific session. Async, served under ASGI."""
+    user: AUNUser = await request.auser()
+    try:
+        session = await EvaluationSession.objects.select_related("staff_response__responder").aget(id=session_id)
+    except EvaluationSession.DoesNotExist:
+        return JsonResponse({"success": False, "message": "Session not found."}, status=404)
     if not (user.is_admin or (user.is_staff_member and user.department_id == session.department_id)):
-        return Response({"success": False, "message": "Forbidden."}, status=403)
+        return JsonResponse({"success": False, "message": "Forbidden."}, status=403)
 
     responses = (
         EvaluationResponse.objects.filter(session=session)
@@ -243,7 +509,7 @@ def session_detail(request, session_id: int):
             "boolean_answer": r.boolean_answer,
             "text_answer": r.text_answer,
         }
-        for r in responses
+        async for r in responses
     ]
 
     staff_reply = None
@@ -254,7 +520,7 @@ def session_detail(request, session_id: int):
             "created_at": session.staff_response.created_at.isoformat(),
         }
 
-    return Response({
+    return JsonResponse({
         "success": True,
         "data": {
             "session": {
@@ -331,6 +597,238 @@ def question_detail(request, question_id: int):
     return Response({"success": True, "message": "Question deactivated."})
 
 
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+def manage_periods(request):
+    """Admin: list or create evaluation periods."""
+    user: AUNUser = request.user
+    if not user.is_admin:
+        return Response({"success": False, "message": "Forbidden."}, status=403)
+
+    if request.method == "GET":
+        periods = EvaluationPeriod.objects.order_by("-start_date", "-id")
+        return Response({"success": True, "data": {"periods": EvaluationPeriodSerializer(periods, many=True).data}})
+
+    return _save_period(EvaluationPeriodSerializer(data=request.data), "Evaluation period created.", status_code=201)
+
+
+@api_view(["PUT", "PATCH", "DELETE"])
+@permission_classes([IsAuthenticated])
+def period_detail(request, period_id: int):
+    """Admin: update or delete an evaluation period."""
+    user: AUNUser = request.user
+    if not user.is_admin:
+        return Response({"success": False, "message": "Forbidden."}, status=403)
+    period = get_object_or_404(EvaluationPeriod, id=period_id)
+
+    if request.method in ["PUT", "PATCH"]:
+        serializer = EvaluationPeriodSerializer(period, data=request.data, partial=request.method == "PATCH")
+        return _save_period(serializer, "Evaluation period updated.")
+
+    # Sessions are protected; their term must outlive them
+    if period.sessions.exists():
+        return Response(
+            {"success": False, "message": "Period has evaluation sessions and cannot be deleted."}, status=400
+        )
+    period.delete()
+    return Response({"success": True, "message": "Evaluation period deleted."})
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def set_active_period(request, period_id: int):
+    """Admin: make a period the active one; every other period is deactivated."""
+    user: AUNUser = request.user
+    if not user.is_admin:
+        return Response({"success": False, "message": "Forbidden."}, status=403)
+    period = get_object_or_404(EvaluationPeriod, id=period_id)
+    period.is_active = True
+    period.save()
+    return Response({"success": True, "message": f"{period.name} is now the active period."})
+
+
+def _save_period(serializer, message, status_code=200):
+    if not serializer.is_valid():
+        return Response(
+            {"success": False, "message": "Invalid evaluation period.", "errors": serializer.errors}, status=400
+        )
+    period = serializer.save()
+    return Response({"success": True, "message": message, "data": EvaluationPeriodSerializer(period).data}, status=status_code)
+
+
+BULK_QUESTION_LIMIT = 1000
+QUESTION_EXPORT_COLUMNS = ["category", "prompt", "scale_type", "order_index", "is_active"]
+
+
+@api_view(["POST", "PATCH"])
+@permission_classes([IsAuthenticated])
+def bulk_questions(request):
+    """Admin/Dept Head: import many questions (JSON or CSV upload) or reorder a department's bank."""
+    user: AUNUser = request.user
+    department_id = request.data.get("department_id")
+    if not department_id or not str(department_id).isdigit():
+        return Response({"success": False, "message": "department_id is required"}, status=400)
+    department_id = int(department_id)
+    if not (user.is_admin or (user.is_department_head and user.department_id == department_id)):
+        return Response({"success": False, "message": "Forbidden."}, status=403)
+
+    if request.method == "PATCH":
+        return _reorder_questions(department_id, request.data.get("order"))
+
+    upload = request.FILES.get("file")
+    if upload is not None:
+        try:
+            rows = _question_rows_from_csv(upload)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            return Response({"success": False, "message": f"Could not read CSV: {exc}"}, status=400)
+    else:
+        rows = request.data.get("questions")
+    if not isinstance(rows, list) or not rows:
+        return Response({"success": False, "message": "questions must be a non-empty list or a CSV file"}, status=400)
+    if len(rows) > BULK_QUESTION_LIMIT:
+        return Response(
+            {"success": False, "message": f"At most {BULK_QUESTION_LIMIT} questions per import"},
+            status=400,
+        )
+    if not Department.objects.filter(id=department_id).exists():
+        return Response({"success": False, "message": "Department not found."}, status=404)
+
+    serializer = QuestionImportSerializer(data=rows, many=True)
+    if serializer.is_valid():
+        rows = [dict(row) for row in serializer.validated_data]
+        errors = _resolve_question_categories(rows)
+    else:
+        # Depending on the DRF version, row errors come back as a list or as a sparse {index: errors} dict
+        row_errors = serializer.errors
+        if isinstance(row_errors, list):
+            row_errors = dict(enumerate(row_errors))
+        errors = {index: detail for index, detail in row_errors.items() if detail}
+    if errors:
+        return Response({
+            "success": False,
+            "message": f"{len(errors)} row(s) failed validation; nothing was imported.",
+            "errors": [{"row": index, "errors": row_errors} for index, row_errors in sorted(errors.items())],
+        }, status=400)
+
+    with transaction.atomic():
+        # Rows without an explicit order_index are appended after the existing bank, in upload order
+        last_index = EvaluationQuestion.objects.filter(department_id=department_id).aggregate(
+            last=Max("order_index")
+        )["last"]
+        next_index = 0 if last_index is None else last_index + 1
+        questions = []
+        for row in rows:
+            order_index = row.get("order_index")
+            if order_index is None:
+                order_index, next_index = next_index, next_index + 1
+            questions.append(EvaluationQuestion(
+                department_id=department_id,
+                category_id=row["category_id"],
+                prompt=row["prompt"].strip(),
+                scale_type=row["scale_type"],
+                order_index=order_index,
+                is_active=row["is_active"],
+                created_by=user,
+            ))
+        EvaluationQuestion.objects.bulk_create(questions, batch_size=500)
+        # bulk_create skips post_save, so the cached lists are dropped explicitly
+        transaction.on_commit(lambda: question_cache.invalidate_department(department_id))
+
+    return Response({
+        "success": True,
+        "message": f"Imported {len(questions)} question(s).",
+        "data": {"created": len(questions)},
+    }, status=201)
+
+
+def _question_rows_from_csv(upload):
+    """Parse an uploaded CSV into import rows, dropping empty cells so serializer defaults apply."""
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    return [
+        {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+        for row in csv.DictReader(text)
+    ]
+
+
+def _resolve_question_categories(rows) -> dict:
+    """Map each row's category id/name to an existing category id in two queries; return per-row errors."""
+    ids = {row["category_id"] for row in rows if row.get("category_id")}
+    names = {row["category"].strip() for row in rows if not row.get("category_id") and row.get("category", "").strip()}
+    known_ids = set(EvaluationCategory.objects.filter(id__in=ids).values_list("id", flat=True))
+    by_name = dict(EvaluationCategory.objects.filter(name__in=names).values_list("name", "id"))
+
+    errors = {}
+    for index, row in enumerate(rows):
+        category_id = row.get("category_id")
+        name = row.get("category", "").strip()
+        if category_id:
+            if category_id not in known_ids:
+                errors[index] = {"category_id": [f"Unknown category id {category_id}."]}
+        elif name:
+            if name not in by_name:
+                errors[index] = {"category": [f"Unknown category '{name}'."]}
+            category_id = by_name.get(name)
+        row["category_id"] = category_id or None
+    return errors
+
+
+def _reorder_questions(department_id: int, order):
+    if not isinstance(order, list) or not order:
+        return Response({"success": False, "message": "order must be a non-empty list of {id, order_index}"}, status=400)
+    serializer = QuestionOrderSerializer(data=order, many=True)
+    if not serializer.is_valid():
+        return Response({"success": False, "message": "Invalid order entries.", "errors": serializer.errors}, status=400)
+
+    new_order = {item["id"]: item["order_index"] for item in serializer.validated_data}
+    with transaction.atomic():
+        questions = list(
+            EvaluationQuestion.objects.select_for_update().filter(department_id=department_id, id__in=new_order)
+        )
+        missing = set(new_order) - {question.id for question in questions}
+        if missing:
+            return Response({
+                "success": False,
+                "message": f"Questions not in this department: {sorted(missing)}",
+            }, status=400)
+        now = timezone.now()
+        for question in questions:
+            question.order_index = new_order[question.id]
+            question.updated_at = now
+        EvaluationQuestion.objects.bulk_update(questions, ["order_index", "updated_at"], batch_size=500)
+        transaction.on_commit(lambda: question_cache.invalidate_department(department_id))
+
+    return Response({"success": True, "message": f"Reordered {len(questions)} question(s)."})
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def export_questions_csv(request, department_id: int):
+    """Admin/Dept Head: stream a department's question bank in the bulk import format."""
+    user: AUNUser = request.user
+    if not (user.is_admin or (user.is_department_head and user.department_id == department_id)):
+        return Response({"success": False, "message": "Forbidden."}, status=403)
+
+    questions = EvaluationQuestion.objects.filter(department_id=department_id)
+    if request.GET.get("include_inactive") not in ("1", "true"):
+        questions = questions.filter(is_active=True)
+    rows = (
+        questions.order_by("order_index", "id")
+        .values_list("category__name", "prompt", "scale_type", "order_index", "is_active")
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    def lines():
+        writer = csv.writer(_Echo())
+        yield writer.writerow(QUESTION_EXPORT_COLUMNS)
+        for category, prompt, scale_type, order_index, is_active in rows:
+            yield writer.writerow([category or "", prompt, scale_type, order_index, "true" if is_active else "false"])
+
+    response = StreamingHttpResponse(_streamed(request, lines()), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="department_{department_id}_questions.csv"'
+    return response
+
+
+@read_from_replica
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def export_department_csv(request, department_id: int):
@@ -339,12 +837,52 @@ def export_department_csv(request, department_id: int):
     if not (user.is_admin or (user.is_department_head and user.department_id == department_id)):
         return Response({"success": False, "message": "Forbidden."}, status=403)
 
-    # Build CSV
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f'attachment; filename="department_{department_id}_evaluations.csv"'
-    writer = csv.writer(response)
+    period = _requested_period(request)
+    rows = _department_csv_rows(department_id, period)
+    response = StreamingHttpResponse(_streamed(request, rows), content_type="text/csv")
+    suffix = f"_period_{period.id}" if period is not None else ""
+    response["Content-Disposition"] = f'attachment; filename="department_{department_id}{suffix}_evaluations.csv"'
+    return response
+
+
+EXPORT_CHUNK_SIZE = 2000
+# CSV lines handed to the ASGI server per hop into the database thread
+ASYNC_EXPORT_LINES = 500
+
+
+def _streamed(request, lines):
+    """Under ASGI, wrap a sync line generator so the body is sent as it is produced.
+
+    Django would otherwise drain a sync iterator with sync_to_async(list) before sending
+    a single byte. Batches are pulled in the request's thread-sensitive database thread,
+    where the export's cursor lives.
+    """
+    if not isinstance(getattr(request, "_request", request), ASGIRequest):
+        return lines
+
+    async def chunks():
+        next_batch = sync_to_async(lambda: "".join(islice(lines, ASYNC_EXPORT_LINES)))
+        try:
+            while batch := await next_batch():
+                yield batch
+        finally:
+            # Release the cursor when the client disconnects mid-download
+            await sync_to_async(lines.close)()
+
+    return chunks()
+
 
-    writer.writerow([
+class _Echo:
+    """File-like object whose write() hands the formatted line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def _department_csv_rows(department_id: int, period=None):
+    """Yield CSV lines for a department's submitted responses without materializing them."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow([
         "session_id",
         "submitted_at",
         "anonymous_identity",
@@ -356,26 +894,47 @@ def export_department_csv(request, department_id: int):
         "text_answer",
     ])
 
-    sessions = EvaluationSession.objects.filter(department_id=department_id, status="submitted")
+    # Question metadata is fetched once instead of being joined onto every row
+    questions = {
+        qid: (prompt.replace("\n", " ").strip(), scale_type, order_index)
+        for qid, prompt, scale_type, order_index in EvaluationQuestion.objects.filter(department_id=department_id)
+        .values_list("id", "prompt", "scale_type", "order_index")
+    }
+
+    responses = EvaluationResponse.objects.filter(session__department_id=department_id, session__status="submitted")
+    if period is not None:
+        responses = responses.filter(session__period=period)
     responses = (
-        EvaluationResponse.objects.filter(session__in=sessions)
-        .select_related("question", "session")
-        .order_by("session_id", "question__order_index")
+        responses.order_by("session_id")
+        .values_list(
+            "session_id",
+            "session__submitted_at",
+            "session__anonymous_identity",
+            "question_id",
+            "score",
+            "boolean_answer",
+            "text_answer",
+        )
     )
 
-    for r in responses:
-        writer.writerow([
-            r.session_id,
-            r.session.submitted_at.isoformat() if r.session.submitted_at else "",
-            r.session.anonymous_identity,
-            r.question_id,
-            r.question.prompt.replace("\n", " ").strip(),
-            r.question.scale_type,
-            r.score if r.score is not None else "",
-            r.boolean_answer if r.boolean_answer is not None else "",
-            (r.text_answer or "").replace("\n", " ").strip(),
-        ])
-
-    return response
-
-
+    def question_order(row):
+        return questions.get(row[3], ("", "", 0))[2], row[3]
+
+    # One session's answers at a time, put in question order here rather than by a join
+    stream = responses.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for _, session_rows in groupby(stream, key=itemgetter(0)):
+        for session_id, submitted_at, anonymous_identity, qid, score, boolean_answer, text_answer in sorted(
+            session_rows, key=question_order
+        ):
+            prompt, scale_type, _ = questions.get(qid, ("", "", 0))
+            yield writer.writerow([
+                session_id,
+                submitted_at.isoformat() if submitted_at else "",
+                anonymous_identity,
+                qid,
+                prompt,
+                scale_type,
+                score if score is not None else "",
+                boolean_answer if boolean_answer is not None else "",
+                (text_answer or "").replace("\n", " ").strip(),
+            ])
@@ -0,0 +1,12 @@
+#!/usr/bin/env bash
+# exit on error
+set -o errexit
+
+# SERVER_MODE=asgi runs uvicorn workers under gunicorn, so the async endpoints
+# (question list, departments, key validation, session detail) keep hundreds of
+# requests in flight per worker while they wait on the database.
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    exec gunicorn backend.asgi:application -k uvicorn_worker.UvicornWorker
+else
+    exec gunicorn backend.wsgi:application
+fi
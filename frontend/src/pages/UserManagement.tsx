@@ -20,6 +20,8 @@ interface UserEditForm {
   is_verified?: boolean;
 }
 
+const PAGE_SIZE = 20;
+
 const UserManagement = () => {
   // State
   const [users, setUsers] = useState<User[]>([]);
@@ -36,6 +38,10 @@ const UserManagement = () => {
   const [departmentFilter, setDepartmentFilter] = useState('');
   const [currentPage, setCurrentPage] = useState(1);
   const [totalPages, setTotalPages] = useState(1);
+  const [totalIsEstimate, setTotalIsEstimate] = useState(false);
+  const [hasNext, setHasNext] = useState(false);
+  // cursors[i] is the keyset cursor that loads page i + 1
+  const [cursors, setCursors] = useState<Array<string | null>>([null]);
 
   // Bulk import
   const [importFile, setImportFile] = useState<File | null>(null);
@@ -50,17 +56,24 @@ const UserManagement = () => {
     try {
       setLoading(true);
       const response = await userManagementService.getUsers({
-        page: currentPage,
-        page_size: 20,
+        cursor: cursors[currentPage - 1] || undefined,
+        page_size: PAGE_SIZE,
         search: searchTerm || undefined,
         role: roleFilter || undefined,
         department: departmentFilter || undefined,
       });
 
       if (response.success && response.data) {
+        const { pagination } = response.data;
         setUsers(response.data.users);
-        setDepartments(response.data.departments);
-        setTotalPages(response.data.pagination.total_pages);
+        setHasNext(pagination.has_next);
+        setTotalIsEstimate(pagination.total_is_estimate);
+        setTotalPages(Math.max(currentPage, Math.ceil(pagination.total_users / pagination.page_size)));
+        setCursors(prev => {
+          const next = prev.slice(0, currentPage);
+          next[currentPage] = pagination.next_cursor;
+          return next;
+        });
       }
     } catch (error: any) {
       console.error('Error fetching users:', error);
@@ -70,10 +83,35 @@ const UserManagement = () => {
     }
   };
 
+  // Departments are reference data served from a cached endpoint, load them once
+  useEffect(() => {
+    userManagementService.getDepartments()
+      .then(response => {
+        if (response.success && response.data) {
+          setDepartments(response.data.departments);
+        }
+      })
+      .catch(error => console.error('Error fetching departments:', error));
+  }, []);
+
   useEffect(() => {
     fetchUsers();
   }, [currentPage, roleFilter, departmentFilter]);
 
+  // Cursors only hold for the filters they were issued under
+  const resetPaging = () => {
+    setCursors([null]);
+    setCurrentPage(1);
+  };
+
+  const applySearch = () => {
+    if (currentPage === 1) {
+      fetchUsers();
+    } else {
+      resetPaging();
+    }
+  };
+
   // View user details
   const viewUserDetails = async (userId: number) => {
     try {
@@ -228,7 +266,7 @@ A00012346,jane.smith@aun.edu.ng,Jane Smith,staff,CS,,,Associate Professor`;
                   placeholder="Search by ID, name, or email..."
                   value={searchTerm}
                   onChange={(e) => setSearchTerm(e.target.value)}
-                  onKeyPress={(e) => e.key === 'Enter' && fetchUsers()}
+                  onKeyPress={(e) => e.key === 'Enter' && applySearch()}
                   className="pl-10 pr-4 py-2 w-full border border-gray-300 rounded-md focus:ring-blue-500 focus:border-blue-500"
                 />
               </div>
@@ -236,7 +274,10 @@ A00012346,jane.smith@aun.edu.ng,Jane Smith,staff,CS,,,Associate Professor`;
               {/* Role Filter */}
               <select
                 value={roleFilter}
-                onChange={(e) => setRoleFilter(e.target.value)}
+                onChange={(e) => {
+                  setRoleFilter(e.target.value);
+                  resetPaging();
+                }}
                 className="px-4 py-2 border border-gray-300 rounded-md focus:ring-blue-500 focus:border-blue-500"
               >
                 <option value="">All Roles</option>
@@ -249,7 +290,10 @@ A00012346,jane.smith@aun.edu.ng,Jane Smith,staff,CS,,,Associate Professor`;
               {/* Department Filter */}
               <select
                 value={departmentFilter}
-                onChange={(e) => setDepartmentFilter(e.target.value)}
+                onChange={(e) => {
+                  setDepartmentFilter(e.target.value);
+                  resetPaging();
+                }}
                 className="px-4 py-2 border border-gray-300 rounded-md focus:ring-blue-500 focus:border-blue-500"
               >
                 <option value="">All Departments</option>
@@ -410,7 +454,7 @@ A00012346,jane.smith@aun.edu.ng,Jane Smith,staff,CS,,,Associate Professor`;
               {/* Pagination */}
               <div className="bg-gray-50 px-6 py-3 flex items-center justify-between border-t border-gray-200">
                 <div className="text-sm text-gray-700">
-                  Page {currentPage} of {totalPages}
+                  Page {currentPage} of {totalIsEstimate ? '~' : ''}{totalPages}
                 </div>
                 <div className="flex gap-2">
                   <button
@@ -421,8 +465,8 @@ A00012346,jane.smith@aun.edu.ng,Jane Smith,staff,CS,,,Associate Professor`;
                     Previous
                   </button>
                   <button
-                    onClick={() => setCurrentPage(p => Math.min(totalPages, p + 1))}
-                    disabled={currentPage === totalPages}
+                    onClick={() => setCurrentPage(p => p + 1)}
+                    disabled={!hasNext}
                     className="px-3 py-1 border border-gray-300 rounded-md disabled:opacity-50 disabled:cursor-not-allowed hover:bg-gray-100"
                   >
                     Next
@@ -2,6 +2,29 @@ import api from './api.ts';
 import type { ApiResponse } from './api.ts';
 import type { EvaluationQuestion, EvaluationResponse } from '../types';
 
+const IDEMPOTENT_RETRIES = 2;
+
+/**
+ * POST with one Idempotency-Key shared by every retry, so a request that reached the
+ * server before the network dropped is replayed there instead of running twice
+ */
+async function postIdempotent<T>(url: string, body: unknown): Promise<T> {
+  const headers = { 'Idempotency-Key': crypto.randomUUID() };
+  for (let attempt = 0; ; attempt++) {
+    try {
+      const response = await api.post<T>(url, body, { headers });
+      return response.data;
+    } catch (err: any) {
+      // Retry only when no response arrived; 409 means the first attempt is still running
+      const retryable = !err.response || err.response.status === 409;
+      if (!retryable || attempt >= IDEMPOTENT_RETRIES) {
+        throw err;
+      }
+      await new Promise(resolve => setTimeout(resolve, 1000 * (attempt + 1)));
+    }
+  }
+}
+
 export const evaluationService = {
   /**
    * Get questions for a department
@@ -19,10 +42,28 @@ export const evaluationService = {
    * Start an evaluation session
    */
   async startEvaluation(departmentId: number, key: string): Promise<ApiResponse<{ session_id: number }>> {
-    const response = await api.post<ApiResponse<{ session_id: number }>>('/eval/start/', {
+    return postIdempotent<ApiResponse<{ session_id: number }>>('/eval/start/', {
       department_id: departmentId,
       key: key,
     });
+  },
+
+  /**
+   * Autosave answers changed since the last save; retries of the same revision are no-ops
+   */
+  async saveDraft(sessionId: number, revision: number, responses: EvaluationResponse[]): Promise<ApiResponse<{ revision: number; saved: boolean; inserted?: number; updated?: number }>> {
+    const response = await api.post<ApiResponse<{ revision: number; saved: boolean; inserted?: number; updated?: number }>>(`/eval/session/${sessionId}/draft/`, {
+      revision: revision,
+      responses: responses,
+    });
+    return response.data;
+  },
+
+  /**
+   * Get the autosaved answers of a session, to resume it
+   */
+  async getDraft(sessionId: number): Promise<ApiResponse<{ revision: number; status: string; responses: EvaluationResponse[] }>> {
+    const response = await api.get<ApiResponse<{ revision: number; status: string; responses: EvaluationResponse[] }>>(`/eval/session/${sessionId}/draft/`);
     return response.data;
   },
 
@@ -30,11 +71,10 @@ export const evaluationService = {
    * Submit evaluation responses
    */
   async submitEvaluation(sessionId: number, responses: EvaluationResponse[]): Promise<ApiResponse> {
-    const response = await api.post<ApiResponse>('/eval/submit/', {
+    return postIdempotent<ApiResponse>('/eval/submit/', {
       session_id: sessionId,
       responses: responses,
     });
-    return response.data;
   },
 
   /**
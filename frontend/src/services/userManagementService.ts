@@ -67,22 +67,21 @@ export interface BulkImportResult {
 class UserManagementService {
   // Get all users with optional filters
   async getUsers(params?: {
-    page?: number;
+    cursor?: string;
     page_size?: number;
+    include_total?: boolean;
     search?: string;
     role?: string;
     department?: string;
   }): Promise<ApiResponse<{
     users: User[];
-    departments: Department[];
     user_roles: Array<{ value: string; label: string }>;
     pagination: {
-      current_page: number;
       page_size: number;
-      total_users: number;
-      total_pages: number;
+      next_cursor: string | null;
       has_next: boolean;
-      has_previous: boolean;
+      total_users: number;
+      total_is_estimate: boolean;
     };
   }>> {
     const response = await api.get('/auth/admin/users/', { params });